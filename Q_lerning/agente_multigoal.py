@@ -0,0 +1,100 @@
+import numpy as np
+
+class GoalConditionedAgent:
+    """Agente tabular condicionado al objetivo para MultiGoalEnvironment.
+
+    La tabla Q tiene forma (celdas libres, objetivos, acciones): solo las
+    celdas que no son pared pueden ser posición del agente u objetivo, así
+    que ambas se indexan de forma compacta. Al final de cada episodio sus
+    transiciones se reetiquetan con celdas alcanzadas más adelante en el
+    mismo episodio (hindsight, estrategia "future") y se actualizan para
+    todos esos objetivos a la vez.
+    """
+    def __init__(self, env, alpha=0.3, gamma=0.8, epsilon=0.2, relabel_goals=4, seed=None):
+        self.env = env
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.relabel_goals = relabel_goals  # Objetivos reetiquetados por transición
+        # Índice compacto de las celdas libres (celda plana = fila * width + columna)
+        self.cells = np.flatnonzero(env.grid.ravel() == 0)
+        self.index = np.full(env.width * env.height, -1, dtype=np.int64)
+        self.index[self.cells] = np.arange(len(self.cells))
+        self.Q = np.zeros((len(self.cells), len(self.cells), 4))  # Tabla Q (celda, objetivo, acción)
+        self.max_actions_per_episode = env.width * env.height
+        self.episodes_done = 0
+        self.rng = np.random.default_rng(seed)
+
+    def _cell(self, state):
+        """Índice compacto de la celda del agente en ``state``."""
+        i, j = self.env.get_grid(state)
+        return int(self.index[i * self.env.width + j])
+
+    def _goal(self, state):
+        """Índice compacto del objetivo de ``state``."""
+        return int(self.index[state[1]])
+
+    def choose_action(self, state, greedy=False):
+        if not greedy and self.rng.random() < self.epsilon:
+            return int(self.rng.integers(4))  # Exploración
+        return int(np.argmax(self.Q[self._cell(state), self._goal(state)]))  # Explotación
+
+    def train(self, num_episodes):
+        """Q-learning condicionado al objetivo con reetiquetado hindsight; devuelve las recompensas por episodio."""
+        rewards_per_episode = []
+        nactions = 0
+
+        for episode in range(num_episodes):
+            state = self.env.reset()
+            cell, goal = self._cell(state), self._goal(state)
+            done = False
+            total_reward = 0
+            if episode % 1000 == 0: print("Training episode: ", episode, nactions)
+            nactions = 0
+            cells, actions, next_cells = [], [], []
+            while not done and nactions < self.max_actions_per_episode:
+                action = self.choose_action(state)
+                state, reward, done = self.env.step(action)
+                next_cell = self._cell(state)
+                total_reward += reward
+                target = reward if done else reward + self.gamma * self.Q[next_cell, goal].max()
+                self.Q[cell, goal, action] += self.alpha * (target - self.Q[cell, goal, action])
+                cells.append(cell)
+                actions.append(action)
+                next_cells.append(next_cell)
+                cell = next_cell
+                nactions += 1
+
+            self._relabel(np.array(cells), np.array(actions), np.array(next_cells))
+            rewards_per_episode.append(total_reward)
+            self.episodes_done += 1
+
+        return rewards_per_episode
+
+    def _relabel(self, cells, actions, next_cells):
+        """Actualiza de una vez las transiciones del episodio con objetivos alcanzados después."""
+        steps = len(cells)
+        if steps == 0 or self.relabel_goals == 0:
+            return
+        t = np.repeat(np.arange(steps), self.relabel_goals)
+        future = t + (self.rng.random(len(t)) * (steps - t)).astype(np.int64)  # Paso futuro uniforme en [t, steps)
+        goals = next_cells[future]
+        cells, actions, next_cells = cells[t], actions[t], next_cells[t]
+        rewards, dones = self.env.compute_rewards(self.cells[next_cells], self.cells[goals])
+        target = rewards + self.gamma * ~dones * self.Q[next_cells, goals].max(axis=1)
+        # Con pares (celda, objetivo, acción) repetidos se aplica una sola de sus actualizaciones
+        self.Q[cells, goals, actions] += self.alpha * (target - self.Q[cells, goals, actions])
+
+    def success_rate(self, num_tests, max_steps_per_test=None):
+        """Fracción de episodios en los que la política voraz alcanza el objetivo."""
+        max_steps = max_steps_per_test or self.max_actions_per_episode
+        successes = 0
+        for _ in range(num_tests):
+            state = self.env.reset()
+            done = False
+            steps = 0
+            while not done and steps < max_steps:
+                state, _, done = self.env.step(self.choose_action(state, greedy=True))
+                steps += 1
+            successes += done
+        return successes / num_tests
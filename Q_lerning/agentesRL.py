@@ -1,28 +1,109 @@
 
 import numpy as np
 import random
-import matplotlib.pyplot as plt
+from env_vector import VectorGridEnv
+from render_rapido import FastRenderer
+from tablas import StepLookup
+from memoria import PriorityQueue, ReplayBuffer
+from estadisticas import RewardTracker
+from evaluacion import evaluate_greedy
+from instrumentacion import unwrap_env
+
+class ExplorationBlocks:
+    """Aleatorios de exploración pre-generados por bloques a partir de una semilla.
+
+    Cada decisión consume siempre un uniforme y una acción aleatoria, se
+    explore o no, así que el bucle de referencia y ``train_fast`` recorren
+    exactamente la misma secuencia.
+    """
+    def __init__(self, seed=None, block_size=4096, num_actions=4):
+        self.rng = np.random.default_rng(seed)
+        self.block_size = block_size
+        self.num_actions = num_actions
+        self._refill()
+
+    def _refill(self):
+        self.uniforms = self.rng.random(self.block_size).tolist()
+        self.actions = self.rng.integers(0, self.num_actions, self.block_size).tolist()
+        self.index = 0
+
+    def draw(self):
+        """Devuelve el siguiente par (uniforme, acción aleatoria)."""
+        if self.index == self.block_size:
+            self._refill()
+        i = self.index
+        self.index = i + 1
+        return self.uniforms[i], self.actions[i]
 
 # Clase Agente
 class Agent:
-    def __init__(self, env, alpha=0.3, gamma=0.8, epsilon=0.2, render_training=False, pause_time=0.1):
+    def __init__(self, env, alpha=0.3, gamma=0.8, epsilon=0.2, render_training=False, pause_time=0.1, seed=None,
+                 render_every=1, render_every_episodes=1, instrumentation=None):
+        if hasattr(env, "compute_reward"):
+            # La Q densa (celdas, celdas, acciones) de MultiGoal ocuparía ~3,3 GB con 101x101
+            raise ValueError("Entorno con objetivos variables: usa agente_multigoal.GoalConditionedAgent")
+        if env.state_shape is None:
+            # Estado continuo (p. ej. Acrobot_Env): no hay tabla Q que dimensionar
+            raise ValueError("Entorno de estado continuo: discretízalo con discretizador.Discretizer "
+                             "o usa teselas.LinearQAgent")
         self.env = env
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
         self.render_training = render_training  # Flag para renderizar el entrenamiento
         self.pause_time = pause_time  # Tiempo de pausa para el renderizado
-        self.Q = np.zeros((env.height ,env.width , 4))  # Tabla Q (ancho, alto, acciones)
-        self.max_actions_per_episode = env.width*env.height
+        # Renderizado con blitting: uno de cada render_every pasos de uno de cada render_every_episodes episodios
+        self.renderer = FastRenderer(env, render_every, render_every_episodes, pause_time)
+        self.Q = np.zeros(tuple(env.state_shape) + (env.n_actions,))  # Tabla Q (componentes del estado..., acciones)
+        self.n_actions = env.n_actions
+        # Límite de pasos por episodio: el que declare el entorno o, en las cuadrículas, su número de celdas
+        self.max_actions_per_episode = getattr(env, "max_episode_steps", None) or env.width*env.height
+        self.episodes_done = 0  # Episodios entrenados en total (para reanudar desde un checkpoint)
+        # Con semilla, la exploración sale de bloques pre-generados; sin ella, del módulo random
+        self.explorer = ExplorationBlocks(seed, num_actions=self.n_actions) if seed is not None else None
+        # Medición opcional de tiempos por fase (instrumentacion.Instrumentation); None no cuesta nada
+        self.instrumentation = None
+        self.tracker = None  # RewardTracker del último entrenamiento (si se pidió)
+        if instrumentation is not None:
+            instrumentation.attach(self)
 
     def choose_action(self, state):
+        if self.explorer is not None:
+            u, random_action = self.explorer.draw()
+            return random_action if u < self.epsilon else np.argmax(self.Q[state[0], state[1]])
         if random.uniform(0, 1) < self.epsilon:
-            return random.randint(0, 3)  # Exploración
+            return random.randint(0, self.n_actions - 1)  # Exploración
         else:
             return np.argmax(self.Q[state[0], state[1]])  # Explotación
 
-    def train_q_learning(self, num_episodes):
+    def _start_tracking(self, num_episodes, tracker, stop):
+        """Tracker del entrenamiento: el dado, uno nuevo si hay criterio de parada, o None."""
+        if tracker is None and stop is not None:
+            tracker = RewardTracker(num_episodes)
+        self.tracker = tracker
+        return tracker
+
+    def _finish_episode(self, rewards_per_episode, total_reward, recorder, checkpoint,
+                        tracker=None, stop=None, steps=0, success=False):
+        """Contabilidad común al final de cada episodio; devuelve True si hay que parar."""
+        if self.render_training:
+            self.renderer.end_episode()
+        if recorder is not None:
+            recorder.end_episode()
+        rewards_per_episode.append(total_reward)  # Almacenar recompensa total del episodio
+        self.episodes_done += 1
+        if self.instrumentation is not None:
+            self.instrumentation.end_episode(self, total_reward)
+        if checkpoint is not None and checkpoint.due(self.episodes_done):
+            checkpoint.save(self)  # Guardar Q, hiperparámetros, episodios y estado aleatorio
+        if tracker is not None:
+            tracker.update(total_reward, steps, success)
+            return stop is not None and stop.due(tracker.count) and stop(self, tracker)
+        return False
+
+    def train_q_learning(self, num_episodes, recorder=None, checkpoint=None, tracker=None, stop=None):
         rewards_per_episode = []  # Lista para almacenar recompensas por episodio
+        tracker = self._start_tracking(num_episodes, tracker, stop)  # Estadísticas en línea y parada temprana
         nactions = 0
 
         for episode in range(num_episodes):
@@ -35,6 +116,8 @@ class Agent:
                 action = self.choose_action(state)  # Elegir acción
                 next_state, reward, done = self.env.step(action)  # Realizar acción
                 total_reward += reward  # Acumular recompensa
+                if recorder is not None:
+                    recorder.record(state, action, reward, next_state, done)  # Grabar la transición
                 # if done: print(" ... Done!")
                 # Actualizar la tabla Q
                 self.Q[state[0], state[1], action] += self.alpha * (
@@ -44,14 +127,17 @@ class Agent:
                 nactions+=1
                 # Renderizar si el flag está activado
                 if self.render_training:
-                    self.env.render()  # Renderizar el entorno
+                    self.renderer.step()  # Renderizar el entorno (solo los fotogramas que tocan)
 
-            rewards_per_episode.append(total_reward)  # Almacenar recompensa total del episodio
+            if self._finish_episode(rewards_per_episode, total_reward, recorder, checkpoint,
+                                    tracker, stop, nactions, done and reward > 0):
+                break
 
         return rewards_per_episode  # Devolver las recompensas por episodio
 
-    def train_sarsa(self, num_episodes):
+    def train_sarsa(self, num_episodes, recorder=None, checkpoint=None, tracker=None, stop=None):
         rewards_per_episode = []  # Lista para almacenar recompensas por episodio
+        tracker = self._start_tracking(num_episodes, tracker, stop)  # Estadísticas en línea y parada temprana
         nactions = 0
 
         for episode in range(num_episodes):
@@ -65,6 +151,8 @@ class Agent:
             while not done and nactions < self.max_actions_per_episode:
                 next_state, reward, done = self.env.step(action)  # Realizar acción
                 total_reward += reward  # Acumular recompensa
+                if recorder is not None:
+                    recorder.record(state, action, reward, next_state, done)  # Grabar la transición
                 next_action = self.choose_action(next_state)  # Elegir la siguiente acción
                 # Actualizar la tabla Q
                 self.Q[state[0], state[1], action] += self.alpha * (
@@ -75,28 +163,453 @@ class Agent:
 
                 # Renderizar si el flag está activado
                 if self.render_training:
-                    self.env.render()  # Renderizar el entorno
+                    self.renderer.step()  # Renderizar el entorno (solo los fotogramas que tocan)
+
+            if self._finish_episode(rewards_per_episode, total_reward, recorder, checkpoint,
+                                    tracker, stop, nactions, done and reward > 0):
+                break
+
+        return rewards_per_episode  # Devolver las recompensas por episodio
+
+    def train_dyna_q(self, num_episodes, planning_steps=10, buffer_capacity=100000, seed=None,
+                     recorder=None, checkpoint=None, tracker=None, stop=None):
+        """Dyna-Q: cada paso real va seguido de planning_steps actualizaciones simuladas.
+
+        Las transiciones reales se guardan en un buffer circular que hace de
+        modelo muestral aprendido: cada (estado, acción) reaparece con sus
+        resultados en la frecuencia observada, también con resbalones. La
+        planificación muestrea transiciones del buffer y actualiza Q de forma
+        vectorizada.
+        """
+        width = self.Q.shape[1]
+        Q = self.Q.reshape(-1, self.n_actions)  # Vista plana de la tabla Q: Q[fila * width + columna]
+        buffer = ReplayBuffer(buffer_capacity, seed)
+        rewards_per_episode = []  # Lista para almacenar recompensas por episodio
+        tracker = self._start_tracking(num_episodes, tracker, stop)  # Estadísticas en línea y parada temprana
+        nactions = 0
+
+        for episode in range(num_episodes):
+            state = self.env.reset()  # Reiniciar el entorno
+            done = False
+            total_reward = 0  # Recompensa total para este episodio
+            if episode%1000 == 0: print("Training episode: ", episode, nactions)
+            nactions = 0
+            while not done and nactions < self.max_actions_per_episode:
+                action = self.choose_action(state)  # Elegir acción
+                next_state, reward, done = self.env.step(action)  # Realizar acción
+                total_reward += reward  # Acumular recompensa
+                if recorder is not None:
+                    recorder.record(state, action, reward, next_state, done)  # Grabar la transición
+                # Actualización con la experiencia real; a diferencia de train_q_learning, sin arrancar
+                # del valor del estado terminal (1 - done), igual que en la planificación
+                s, ns = state[0] * width + state[1], next_state[0] * width + next_state[1]
+                Q[s, action] += self.alpha * (reward + self.gamma * np.max(Q[ns]) * (1 - done) - Q[s, action])
+                buffer.add(s, action, reward, ns, done)  # Aprender el modelo
+                if planning_steps:
+                    self._plan(Q, buffer, planning_steps)
+                state = next_state  # Avanzar al siguiente estado
+                nactions+=1
+                # Renderizar si el flag está activado
+                if self.render_training:
+                    self.renderer.step()  # Renderizar el entorno (solo los fotogramas que tocan)
 
-            rewards_per_episode.append(total_reward)  # Almacenar recompensa total del episodio
+            if self._finish_episode(rewards_per_episode, total_reward, recorder, checkpoint,
+                                    tracker, stop, nactions, done and reward > 0):
+                break
 
         return rewards_per_episode  # Devolver las recompensas por episodio
 
-    def test_agent(self, num_tests, max_steps_per_test=100):
-        """Ejecuta pruebas del agente después de haber aprendido."""
+    def _plan(self, Q, buffer, planning_steps):
+        """planning_steps actualizaciones Q-learning simuladas con el buffer, en una sola operación.
+
+        Si un (estado, acción) sale varias veces en la muestra recibe una sola
+        actualización hacia la media de sus objetivos; sumarlas sin más
+        multiplicaría el paso (alpha * repeticiones) al principio, cuando el
+        buffer tiene pocas transiciones.
+        """
+        states, actions, rewards, next_states, dones = buffer.sample(planning_steps)
+        deltas = rewards + self.gamma * np.max(Q[next_states], axis=1) * (1 - dones) - Q[states, actions]
+        pairs, inverse = np.unique(states * Q.shape[1] + actions, return_inverse=True)
+        flat = Q.reshape(-1)  # Vista sobre Q, indexada por estado * acciones + acción
+        flat[pairs] += self.alpha * np.bincount(inverse, weights=deltas) / np.bincount(inverse)
+
+    def train_prioritized_sweeping(self, num_episodes, planning_steps=10, theta=1e-4,
+                                   recorder=None, checkpoint=None, tracker=None, stop=None):
+        """Barrido priorizado: tras cada paso real se procesan las actualizaciones de mayor error TD.
+
+        Se mantiene un modelo tabular, el índice de predecesores de cada
+        estado y una cola de prioridad de pares (estado, acción) cuyo error TD
+        supera ``theta``. Cada actualización reencola a los predecesores del
+        estado actualizado, de modo que la recompensa se propaga hacia atrás
+        sin esperar a que el agente vuelva a visitarlos. Como ``train_fast``,
+        trabaja sobre una copia de Q en listas que se vuelca en ``self.Q``
+        al final de cada episodio. En laberintos grandes conviene un gamma
+        cercano a 1: con gamma=0.8 las diferencias de valor caen por debajo de
+        ``theta`` a unas decenas de pasos y la propagación se detiene.
+        """
+        env = self.env
+        width = self.Q.shape[1]  # Paso de la vista plana de Q (env.width en las cuadrículas)
+        alpha, gamma = self.alpha, self.gamma
+        n = self.n_actions
+        Q = self.Q.reshape(-1, n).tolist()  # Q[fila * width + columna] -> lista de n valores
+        choose = self._list_policy(Q)
+        model = {}  # estado * n + acción -> (recompensa, siguiente estado, fin)
+        predecessors = [set() for _ in range(len(Q))]  # estado -> {estado previo * n + acción}
+        queue = PriorityQueue()  # Claves: estado * n + acción
+        rewards_per_episode = []  # Lista para almacenar recompensas por episodio
+        tracker = self._start_tracking(num_episodes, tracker, stop)  # Estadísticas en línea y parada temprana
+        nactions = 0
+
+        def td_error(key):
+            r, ns, d = model[key]
+            s, a = divmod(key, n)
+            return r + (0.0 if d else gamma * max(Q[ns])) - Q[s][a]
+
+        for episode in range(num_episodes):
+            state = env.reset()  # Reiniciar el entorno
+            done = False
+            total_reward = 0  # Recompensa total para este episodio
+            if episode%1000 == 0: print("Training episode: ", episode, nactions)
+            nactions = 0
+            while not done and nactions < self.max_actions_per_episode:
+                s = state[0] * width + state[1]
+                action = choose(s)  # Elegir acción
+                next_state, reward, done = env.step(action)  # Realizar acción
+                total_reward += reward  # Acumular recompensa
+                if recorder is not None:
+                    recorder.record(state, action, reward, next_state, done)  # Grabar la transición
+                ns = next_state[0] * width + next_state[1]
+                key = s * n + action
+                model[key] = (reward, ns, done)  # Aprender el modelo
+                predecessors[ns].add(key)
+                priority = abs(td_error(key))
+                if priority > theta:
+                    queue.push(key, priority)
+
+                # Procesar las actualizaciones más prioritarias
+                for _ in range(planning_steps):
+                    if not queue:
+                        break
+                    key, _ = queue.pop()
+                    ps, pa = divmod(key, n)
+                    Q[ps][pa] += alpha * td_error(key)
+                    for pred in predecessors[ps]:
+                        priority = abs(td_error(pred))
+                        if priority > theta:
+                            queue.push(pred, priority)
+
+                state = next_state  # Avanzar al siguiente estado
+                nactions+=1
+                # Renderizar si el flag está activado
+                if self.render_training:
+                    self.renderer.step()  # Renderizar el entorno (solo los fotogramas que tocan)
+
+            self.Q[:] = np.array(Q).reshape(self.Q.shape)
+            if self._finish_episode(rewards_per_episode, total_reward, recorder, checkpoint,
+                                    tracker, stop, nactions, done and reward > 0):
+                break
+
+        return rewards_per_episode  # Devolver las recompensas por episodio
+
+    def train_lambda(self, num_episodes, lam=0.9, algorithm="sarsa", trace="replacing", cutoff=1e-3,
+                     recorder=None, checkpoint=None, tracker=None, stop=None):
+        """SARSA(λ) o Q(λ) de Watkins con trazas de elegibilidad dispersas.
+
+        Las trazas son un diccionario con solo los pares (estado, acción)
+        activos: cada paso actualiza esas entradas, las multiplica por
+        gamma * lam y descarta las que caen por debajo de ``cutoff``, así que
+        el coste por paso no depende del tamaño de la cuadrícula. ``trace``
+        elige trazas "replacing" (la del par visitado vuelve a 1) o
+        "accumulating" (se le suma 1). En Q(λ) las trazas se borran tras una
+        acción exploratoria. Como ``train_prioritized_sweeping``, trabaja
+        sobre una copia de Q en listas que se vuelca en ``self.Q`` al final de
+        cada episodio.
+        """
+        if algorithm not in ("q_learning", "sarsa"):
+            raise ValueError("Algoritmo no válido")
+        if trace not in ("replacing", "accumulating"):
+            raise ValueError("Tipo de traza no válido: " + str(trace))
+        env = self.env
+        width = self.Q.shape[1]  # Paso de la vista plana de Q (env.width en las cuadrículas)
+        alpha, gamma = self.alpha, self.gamma
+        decay = gamma * lam
+        watkins = algorithm == "q_learning"
+        replacing = trace == "replacing"
+        Q = self.Q.reshape(-1, self.n_actions).tolist()  # Q[fila * width + columna] -> lista de valores
+        choose = self._list_policy(Q)
+        rewards_per_episode = []  # Lista para almacenar recompensas por episodio
+        tracker = self._start_tracking(num_episodes, tracker, stop)  # Estadísticas en línea y parada temprana
+        nactions = 0
+
+        for episode in range(num_episodes):
+            state = env.reset()  # Reiniciar el entorno
+            s = state[0] * width + state[1]
+            action = choose(s)
+            traces = {}  # (estado, acción) -> traza de elegibilidad
+            done = False
+            total_reward = 0  # Recompensa total para este episodio
+            if episode%1000 == 0: print("Training episode: ", episode, nactions)
+            nactions = 0
+            while not done and nactions < self.max_actions_per_episode:
+                next_state, reward, done = env.step(action)  # Realizar acción
+                total_reward += reward  # Acumular recompensa
+                if recorder is not None:
+                    recorder.record(state, action, reward, next_state, done)  # Grabar la transición
+                ns = next_state[0] * width + next_state[1]
+                next_action = choose(ns)
+                q_next = Q[ns]
+                best_next = max(q_next)
+                exploratory = q_next[next_action] != best_next  # Antes de actualizar Q
+                if done:
+                    target = reward
+                else:
+                    target = reward + gamma * (best_next if watkins else q_next[next_action])
+                delta = alpha * (target - Q[s][action])
+
+                key = (s, action)
+                traces[key] = 1.0 if replacing else traces.get(key, 0.0) + 1.0
+                # Actualizar solo los pares con traza activa y desvanecer las trazas
+                for (ts, ta), e in traces.items():
+                    Q[ts][ta] += delta * e
+                traces = {k: e * decay for k, e in traces.items() if e * decay >= cutoff}
+                if watkins and exploratory:
+                    traces.clear()  # La acción siguiente no es voraz: se corta el retorno λ
+
+                state, s, action = next_state, ns, next_action  # Avanzar al siguiente estado y acción
+                nactions+=1
+                # Renderizar si el flag está activado
+                if self.render_training:
+                    self.renderer.step()  # Renderizar el entorno (solo los fotogramas que tocan)
+
+            self.Q[:] = np.array(Q).reshape(self.Q.shape)
+            if self._finish_episode(rewards_per_episode, total_reward, recorder, checkpoint,
+                                    tracker, stop, nactions, done and reward > 0):
+                break
+
+        return rewards_per_episode  # Devolver las recompensas por episodio
+
+    def _list_policy(self, Q):
+        """Política epsilon-greedy sobre una tabla Q en listas indexada por estado plano.
+
+        Consume los aleatorios exactamente igual que ``choose_action``.
+        """
+        epsilon = self.epsilon
+        rand, randint = random.random, random.randint
+        last_action = self.n_actions - 1
+        draw = self.explorer.draw if self.explorer is not None else None
+
+        if self.n_actions == 4:
+            def greedy(q):
+                # Mismo desempate que np.argmax: la primera acción con el valor máximo
+                best = 0
+                if q[1] > q[best]: best = 1
+                if q[2] > q[best]: best = 2
+                if q[3] > q[best]: best = 3
+                return best
+        else:
+            def greedy(q):
+                return q.index(max(q))  # También la primera con el valor máximo
+
+        def choose(s):
+            if draw is not None:
+                u, random_action = draw()
+                return random_action if u < epsilon else greedy(Q[s])
+            if rand() < epsilon:
+                return randint(0, last_action)
+            return greedy(Q[s])
+
+        if self.instrumentation is not None:
+            return self.instrumentation.wrap(choose, "choose_action")
+        return choose
+
+    def train_fast(self, num_episodes, algorithm="q_learning", render=False, recorder=None, checkpoint=None,
+                   tracker=None, stop=None):
+        """Motor de entrenamiento de bajo coste por paso.
+
+        Produce exactamente las mismas recompensas y tabla Q que
+        ``train_q_learning``/``train_sarsa`` con la misma semilla. Trabaja
+        sobre una copia de Q en listas de Python indexada por estado plano,
+        resuelve argmax/max sin NumPy, consulta directamente las tablas
+        compiladas del entorno y no comprueba el renderizado si
+        ``render`` es False. ``recorder`` (p. ej. un TrajectoryRecorder)
+        recibe las mismas transiciones que en los bucles de referencia, y
+        ``checkpoint`` (un Checkpointer) guarda el progreso periódicamente.
+        ``tracker`` y ``stop`` funcionan como en los bucles de referencia.
+        """
+        if algorithm not in ("q_learning", "sarsa"):
+            raise ValueError("Algoritmo no válido")
+        sarsa = algorithm == "sarsa"
+        env = self.env
+        width = self.Q.shape[1]  # Paso de la vista plana de Q (env.width en las cuadrículas)
+        Q = self.Q.reshape(-1, self.n_actions).tolist()  # Q[fila * width + columna] -> lista de valores
+        alpha, gamma = self.alpha, self.gamma
+        max_actions = self.max_actions_per_episode
+
+        # Aleatorios: mismas llamadas y en el mismo orden que el bucle de referencia
+        rand, choice = random.random, random.choice
+        choose = self._list_policy(Q)
+
+        # Dinámica: tablas compiladas del entorno en índices planos, o env.step si no las tiene
+        tables = hasattr(env, "next_state_table")
+        if tables:
+            transitions = StepLookup(env.next_state_table, env.reward_table, env.done_table, width, flat=True)
+            slip = env.slippery_float if getattr(env, "slippery", False) else None
+            stays_on_done = hasattr(env, "lake")  # FrozenLake no avanza al caer o llegar a la meta
+            actions = [0, 1, 2, 3]
+        step = env.step
+        render_step = self.renderer.step if render else None
+        record = recorder.record if recorder is not None else None
+
+        rewards_per_episode = []
+        tracker = self._start_tracking(num_episodes, tracker, stop)
+        nactions = 0
+        s = prev_s = 0
+        done = False
+        for episode in range(num_episodes):
+            state = env.reset()
+            s = state[0] * width + state[1]
+            if sarsa:
+                action = choose(s)
+            done = False
+            total_reward = 0
+            if episode % 1000 == 0: print("Training episode: ", episode, nactions)
+            nactions = 0
+            while not done and nactions < max_actions:
+                if not sarsa:
+                    action = choose(s)
+                if tables:
+                    executed = action
+                    if slip is not None and rand() < slip:
+                        executed = choice(actions)
+                    next_s, reward, done = transitions[s][executed]
+                else:
+                    next_state, reward, done = step(action)
+                    next_s = next_state[0] * width + next_state[1]
+                total_reward += reward
+                if record is not None:
+                    record(divmod(s, width), action, reward, divmod(next_s, width), done)
+                q = Q[s]
+                if sarsa:
+                    next_action = choose(next_s)
+                    q[action] += alpha * (reward + gamma * Q[next_s][next_action] - q[action])
+                    action = next_action
+                else:
+                    q[action] += alpha * (reward + gamma * max(Q[next_s]) - q[action])
+                if render_step is not None:
+                    if tables:
+                        env.state = divmod(s if done and stays_on_done else next_s, width)
+                    render_step()
+                prev_s, s = s, next_s
+                nactions += 1
+            if render:
+                self.renderer.end_episode()
+            if record is not None:
+                recorder.end_episode()
+            rewards_per_episode.append(total_reward)
+            self.episodes_done += 1
+            if self.instrumentation is not None:
+                self.instrumentation.end_episode(self, total_reward, nactions, done)
+            if checkpoint is not None and checkpoint.due(self.episodes_done):
+                self.Q[:] = np.array(Q).reshape(self.Q.shape)  # Sincronizar la copia de trabajo
+                checkpoint.save(self)
+            if tracker is not None:
+                tracker.update(total_reward, nactions, done and reward > 0)
+                if stop is not None and stop.due(tracker.count):
+                    if stop.uses_q:
+                        self.Q[:] = np.array(Q).reshape(self.Q.shape)
+                    if stop(self, tracker):
+                        break
+
+        if tables and nactions:
+            # Dejar el entorno en el mismo estado en que lo habría dejado env.step
+            env.state = divmod(prev_s if done and stays_on_done else s, width)
+        self.Q[:] = np.array(Q).reshape(self.Q.shape)
+        return rewards_per_episode
+
+    def _batch_actions(self, Q, states, rng):
+        """Política epsilon-greedy aplicada a un array de estados planos."""
+        greedy = np.argmax(Q[states], axis=1)
+        explore = rng.random(len(states)) < self.epsilon
+        return np.where(explore, rng.integers(0, self.n_actions, len(states)), greedy)
+
+    def train_batch(self, num_episodes, num_envs=64, algorithm="q_learning", seed=None):
+        """Entrena con num_envs copias del entorno avanzando a la vez (VectorGridEnv)."""
+        if not hasattr(self.env, "next_state_table"):
+            raise ValueError("train_batch necesita un entorno de cuadrícula con tablas compiladas")
+        venv = VectorGridEnv(unwrap_env(self.env), num_envs, seed=seed)
+        rng = venv.rng
+        Q = self.Q.reshape(-1, self.n_actions)  # Vista plana de la tabla Q: Q[fila * width + columna]
+
+        rewards_per_episode = []  # Lista para almacenar recompensas por episodio
+        returns = np.zeros(num_envs)  # Recompensa acumulada de cada carril
+        lengths = np.zeros(num_envs, dtype=np.int64)  # Acciones de cada carril en su episodio
+        states = venv.reset()
+        actions = self._batch_actions(Q, states, rng)
+
+        while len(rewards_per_episode) < num_episodes:
+            next_states, rewards, dones = venv.step(actions)
+            returns += rewards
+            lengths += 1
+
+            if algorithm == "q_learning":
+                next_values = np.max(Q[next_states], axis=1)
+            elif algorithm == "sarsa":
+                next_actions = self._batch_actions(Q, next_states, rng)
+                next_values = Q[next_states, next_actions]
+            else:
+                raise ValueError("Algoritmo no válido")
+            # Actualizar la tabla Q; si varios carriles comparten (estado, acción) se aplica
+            # una sola de sus actualizaciones, igual que un paso del bucle secuencial
+            Q[states, actions] += self.alpha * (
+                rewards + self.gamma * next_values - Q[states, actions]
+            )
+
+            # Carriles que terminan por llegar a un estado final o por exceder el límite de acciones
+            truncated = ~dones & (lengths >= self.max_actions_per_episode)
+            finished = dones | truncated
+            if finished.any():
+                before = len(rewards_per_episode)
+                rewards_per_episode.extend(returns[finished].tolist())
+                if before // 1000 != len(rewards_per_episode) // 1000:
+                    print("Training episode: ", len(rewards_per_episode))
+                returns[finished] = 0
+                lengths[finished] = 0
+                venv.reset(truncated)
+
+            states = venv.states
+            if algorithm == "q_learning":
+                actions = self._batch_actions(Q, states, rng)
+            else:
+                # Los carriles reiniciados eligen de nuevo desde el estado inicial
+                actions = np.where(finished, self._batch_actions(Q, states, rng), next_actions)
+
+        self.episodes_done += num_episodes
+        return rewards_per_episode[:num_episodes]  # Devolver las recompensas por episodio
+
+    def evaluate(self, num_rollouts=10000, max_steps=None, seed=None):
+        """Evalúa la política voraz con num_rollouts episodios vectorizados (ver evaluacion.evaluate_greedy)."""
+        if max_steps is None:
+            max_steps = self.max_actions_per_episode
+        return evaluate_greedy(self.env, self.Q, num_rollouts, max_steps, seed)
+
+    def test_agent(self, num_tests, max_steps_per_test=100, render=True):
+        """Ejecuta pruebas del agente después de haber aprendido, siguiendo la política voraz."""
         for test in range(num_tests):
             state = self.env.reset()  # Reiniciar el entorno para cada prueba
             done = False
             step_count = 0  # Contador de pasos
             print(f"Prueba {test + 1}:")
-            self.env.render()  # Mostrar el entorno antes de la prueba
+            if render:
+                self.env.render()  # Mostrar el entorno antes de la prueba
 
             while not done and step_count < max_steps_per_test:
-                action = self.choose_action(state)  # Elegir acción basada en Q
+                action = np.argmax(self.Q[state[0], state[1]])  # Mejor acción según Q, sin explorar
                 next_state, reward, done = self.env.step(action)  # Realizar acción
                 state = next_state  # Avanzar al siguiente estado
                 step_count += 1  # Incrementar el contador de pasos
                 # Renderizar el entorno después de cada acción
-                self.env.render()  # Renderizar el entorno
+                if render:
+                    self.env.render()  # Renderizar el entorno
 
             if step_count >= max_steps_per_test:
                 print(f"Prueba {test + 1} terminada por exceder el límite de pasos ({max_steps_per_test}).")
@@ -0,0 +1,98 @@
+import contextlib
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from entornos import make
+
+def _init_worker():
+    """Cada proceso usa un backend sin ventanas: no se comparte estado de matplotlib."""
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+def build_env(name, kwargs):
+    """Construye un entorno del registro (entornos.REGISTRY) a partir de su nombre y sus argumentos."""
+    return make(name, **kwargs)
+
+def run_task(task):
+    """Entrena un agente con una combinación (hiperparámetros, entorno, semilla)."""
+    from agentesRL import Agent
+
+    params, (env_name, env_kwargs), seed, num_episodes = task
+    # La semilla fija también la disposición del entorno, igual para todos los hiperparámetros
+    random.seed(seed)
+    np.random.seed(seed)
+    env = build_env(env_name, env_kwargs)
+    agent = Agent(env, alpha=params["alpha"], gamma=params["gamma"], epsilon=params["epsilon"])
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(None):  # Silenciar el progreso de cada entrenamiento
+        rewards = agent.train_fast(num_episodes, algorithm=params["algorithm"])
+    return {
+        "params": params,
+        "env": env_name,
+        "env_kwargs": env_kwargs,
+        "seed": seed,
+        "rewards": np.asarray(rewards, dtype=np.float32),
+        "seconds": time.perf_counter() - start,
+    }
+
+def expand_grid(param_grid):
+    """Producto cartesiano de {nombre: [valores]} como lista de diccionarios."""
+    names = list(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+def run_sweep(param_grid, env_configs, seeds, num_episodes, max_workers=None, measure_serial=False):
+    """Reparte hiperparámetros x entornos x semillas en un ProcessPoolExecutor.
+
+    ``param_grid`` es un diccionario con listas para alpha, gamma, epsilon y
+    algorithm; ``env_configs`` una lista de pares (nombre, kwargs). Devuelve
+    ``(results, report)``: los resultados en el orden de las tareas, con las
+    recompensas por episodio como arrays float32, y un informe con el tiempo
+    real y la aceleración frente a la ejecución en serie. Por defecto el
+    tiempo en serie se estima sumando lo que tarda cada tarea; con
+    ``measure_serial`` se ejecuta de verdad en serie.
+    """
+    defaults = {"alpha": [0.3], "gamma": [0.8], "epsilon": [0.2], "algorithm": ["q_learning"]}
+    grid = expand_grid({**defaults, **param_grid})
+    tasks = [(params, tuple(config), seed, num_episodes)
+             for params in grid for config in env_configs for seed in seeds]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        results = list(pool.map(run_task, tasks))
+    wall = time.perf_counter() - start
+
+    if measure_serial:
+        start = time.perf_counter()
+        for task in tasks:
+            run_task(task)
+        serial = time.perf_counter() - start
+    else:
+        serial = sum(result["seconds"] for result in results)
+
+    report = {
+        "tasks": len(tasks),
+        "workers": max_workers or os.cpu_count(),
+        "wall_seconds": wall,
+        "serial_seconds": serial,
+        "speedup": serial / wall,
+    }
+    return results, report
+
+if __name__ == "__main__":
+    # Los agentes 1-4 de main.py (distintos epsilon) en paralelo y con varias semillas
+    results, report = run_sweep(
+        {"epsilon": [0.2, 0.3, 0.6, 0.9]},
+        [("FrozenLakeEnvironment", {"width": 10, "height": 10, "slippery_float": 0.4})],
+        seeds=[0, 1, 2],
+        num_episodes=2000,
+    )
+    for result in results:
+        print(result["params"], "semilla", result["seed"],
+              "recompensa media (últimos 100):", result["rewards"][-100:].mean())
+    print(f"{report['tasks']} tareas en {report['wall_seconds']:.2f} s "
+          f"(serie: {report['serial_seconds']:.2f} s, aceleración x{report['speedup']:.1f})")
@@ -0,0 +1,212 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import types
+
+import numpy as np
+
+# Banco de pruebas sin pantalla: pasos por segundo de cada entorno (barriendo
+# tamaños de cuadrícula) y actualizaciones por segundo y episodios hasta el
+# umbral de Agent.train_q_learning y train_sarsa. Los resultados se escriben en
+# JSON y pueden compararse con una línea base guardada para detectar
+# regresiones:
+#
+#     python benchmark.py --output resultados.json --baseline base.json
+
+class _Null:
+    """Objeto que acepta cualquier atributo o llamada y se devuelve a sí mismo."""
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+def _stub_matplotlib():
+    """Sustituye matplotlib por módulos vacíos para que nada abra ventanas ni lo necesite instalado."""
+    if "matplotlib" in sys.modules:
+        return  # Ya importado de verdad: los entornos ya tienen su plt
+    matplotlib = types.ModuleType("matplotlib")
+    pyplot = types.ModuleType("matplotlib.pyplot")
+    matplotlib.__getattr__ = pyplot.__getattr__ = lambda name: _Null()
+    matplotlib.pyplot = pyplot
+    sys.modules["matplotlib"] = matplotlib
+    sys.modules["matplotlib.pyplot"] = pyplot
+
+def _seed(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+
+def _result(name, value, unit, higher_is_better=True):
+    return {"name": name, "value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+def _grid_envs(size, seed):
+    """Entornos de cuadrícula de lado ``size`` con su nombre."""
+    from env_2D import Environment2D
+    from env_frozen import FrozenLakeEnvironment
+    from env_maze import MazeEnvironment
+    from env_multigoal import MultiGoalEnvironment
+    return [
+        ("Environment2D", lambda: Environment2D(size, size, 0.2)),
+        ("FrozenLakeEnvironment", lambda: FrozenLakeEnvironment(size, size, seed=seed)),
+        ("MazeEnvironment", lambda: MazeEnvironment(size, size, seed=seed)),
+        ("MultiGoalEnvironment", lambda: MultiGoalEnvironment(size, size, seed=seed)),
+    ]
+
+def _time_steps(env, actions):
+    """Segundos para aplicar ``actions`` reiniciando el entorno al terminar cada episodio."""
+    env.reset()
+    start = time.perf_counter()
+    for action in actions:
+        done = env.step(action)[2]
+        if done:
+            env.reset()
+    return time.perf_counter() - start
+
+def bench_env_steps(sizes, steps, seed=0):
+    """Pasos por segundo (y tiempo de construcción) de cada entorno."""
+    from brazo2dof import Acrobot_Env
+    from pendulo import BatchedPendulumEnv, SimplePendulumEnv
+
+    results = []
+    rng = np.random.default_rng(seed)
+    for size in sizes:
+        for name, make in _grid_envs(size, seed):
+            _seed(seed)
+            start = time.perf_counter()
+            env = make()
+            results.append(_result(f"env_build/{name}/{size}x{size}", time.perf_counter() - start, "s", False))
+            seconds = _time_steps(env, rng.integers(0, 4, steps).tolist())
+            results.append(_result(f"env_step/{name}/{size}x{size}", steps / seconds, "steps/s"))
+
+    for name, make, num_actions in (("SimplePendulumEnv", SimplePendulumEnv, 5), ("Acrobot_Env", Acrobot_Env, 3)):
+        _seed(seed)
+        env = make()
+        seconds = _time_steps(env, rng.integers(0, num_actions, steps).tolist())
+        results.append(_result(f"env_step/{name}", steps / seconds, "steps/s"))
+
+    num_envs = 256
+    env = BatchedPendulumEnv(num_envs, seed=seed)
+    actions = rng.integers(0, 5, (max(1, steps // num_envs), num_envs))
+    start = time.perf_counter()
+    for batch in actions:
+        env.step(batch)
+    seconds = time.perf_counter() - start
+    results.append(_result(f"env_step/BatchedPendulumEnv/{num_envs}", actions.size / seconds, "steps/s"))
+    return results
+
+class _StepCounter:
+    """Grabador mínimo (interfaz de TrajectoryRecorder) que cuenta pasos y éxitos por episodio."""
+    def __init__(self):
+        self.steps = 0
+        self.last_done = False
+        self.successes = []
+
+    def record(self, state, action, reward, next_state, done):
+        self.steps += 1
+        self.last_done = done
+
+    def end_episode(self):
+        self.successes.append(self.last_done)
+        self.last_done = False
+
+def _episodes_to_threshold(successes, threshold, window):
+    """Primer episodio en el que la tasa de éxito de los últimos ``window`` alcanza ``threshold``."""
+    rate = np.convolve(successes, np.ones(window) / window, mode="valid")
+    hits = np.flatnonzero(rate >= threshold)
+    return int(hits[0] + window) if len(hits) else None
+
+def bench_agents(sizes, episodes, seed=0, threshold=0.9, window=50):
+    """Actualizaciones por segundo y episodios hasta el umbral de éxito de Q-learning y SARSA."""
+    from agentesRL import Agent
+    from env_2D import Environment2D
+
+    results = []
+    for size in sizes:
+        for algorithm in ("q_learning", "sarsa"):
+            _seed(seed)
+            agent = Agent(Environment2D(size, size))
+            counter = _StepCounter()
+            train = getattr(agent, "train_" + algorithm)
+            with contextlib.redirect_stdout(None):
+                start = time.perf_counter()
+                train(episodes, recorder=counter)
+                seconds = time.perf_counter() - start
+            prefix = f"agent/{algorithm}/{size}x{size}"
+            results.append(_result(prefix + "/updates", counter.steps / seconds, "updates/s"))
+            results.append(_result(prefix + "/episodes_to_threshold",
+                                   _episodes_to_threshold(counter.successes, threshold, window), "episodes", False))
+    return results
+
+def run_benchmarks(sizes=(10, 50, 200), steps=100000, agent_sizes=(5, 10), episodes=500, seed=0):
+    """Ejecuta todas las pruebas y devuelve el documento de resultados."""
+    _stub_matplotlib()
+    results = bench_env_steps(sizes, steps, seed) + bench_agents(agent_sizes, episodes, seed)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "seed": seed,
+            "sizes": list(sizes),
+            "steps": steps,
+            "agent_sizes": list(agent_sizes),
+            "episodes": episodes,
+        },
+        "results": results,
+    }
+
+def compare(report, baseline, tolerance=0.2):
+    """Resultados que empeoran más de ``tolerance`` (fracción) respecto a la línea base."""
+    previous = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get(result["name"])
+        if old is None or old["value"] is None:
+            continue
+        new = result["value"]
+        if new is None:  # Ya no alcanza el umbral
+            regressions.append({"name": result["name"], "baseline": old["value"], "value": None, "change": None})
+            continue
+        change = (new - old["value"]) / old["value"] if old["value"] else 0.0
+        worse = -change if result["higher_is_better"] else change
+        if worse > tolerance:
+            regressions.append({"name": result["name"], "baseline": old["value"], "value": new, "change": change})
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de pruebas sin pantalla de entornos y agentes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200], help="lados de cuadrícula")
+    parser.add_argument("--steps", type=int, default=100000, help="pasos por entorno")
+    parser.add_argument("--agent-sizes", type=int, nargs="+", default=[5, 10], help="lados para los agentes")
+    parser.add_argument("--episodes", type=int, default=500, help="episodios por agente")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json", help="fichero JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="empeoramiento relativo admitido")
+    args = parser.parse_args(argv)
+    if args.baseline and not os.path.exists(args.baseline):
+        # Sin base no hay comparación: que una comprobación de CI no pase por descuido
+        parser.error("no existe el fichero de base: " + args.baseline)
+
+    report = run_benchmarks(args.sizes, args.steps, args.agent_sizes, args.episodes, args.seed)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    for result in report["results"]:
+        value = "-" if result["value"] is None else f"{result['value']:.4g}"
+        print(f"{result['name']:<60} {value:>12} {result['unit']}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for r in regressions:
+            print("REGRESIÓN", r["name"], "base:", r["baseline"], "ahora:", r["value"])
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
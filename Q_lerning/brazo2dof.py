@@ -1,6 +1,7 @@
 import numpy as np
 import math
-import matplotlib.pyplot as plt
+from render_rapido import FastRenderer
+from discretizador import Discretizer
 
 class Acrobot_Env:
     def __init__(self, target_position=(1.0, 1.0), tolerance=0.05):
@@ -19,9 +20,15 @@ class Acrobot_Env:
 
         self.dt = 0.2  # Paso de tiempo
 
+        # Límites de la observación (cos θ1, sin θ1, cos θ2, sin θ2, θ̇1, θ̇2), p. ej. para teselas
+        self.observation_low = np.array([-1.0, -1.0, -1.0, -1.0, -self.MAX_VEL_1, -self.MAX_VEL_2])
+        self.observation_high = -self.observation_low
+
         # Limites de torque reducidos para aumentar la dificultad
         self.TORQUE = 0.5
         self.actions = [-self.TORQUE, 0.0, self.TORQUE]  # Menos fuerza aplicada en cada acción
+        self.n_actions = len(self.actions)
+        self.state_shape = None  # Observación continua: usar discretizer() o teselas
 
         # Posición objetivo (x, y)
         self.target_position = target_position
@@ -57,7 +64,7 @@ class Acrobot_Env:
         # Recompensa basada en la distancia al objetivo
         reward = self._calculate_reward()
 
-        return obs, reward, done, {}
+        return obs, reward, done
 
     def _apply_dynamics(self, torque):
         """Aplica las ecuaciones de movimiento del Acrobot"""
@@ -127,6 +134,10 @@ class Acrobot_Env:
 
         return x, y
 
+    def discretizer(self, bins=6):
+        """Discretizador uniforme de la observación para agentes tabulares."""
+        return Discretizer.uniform(self.observation_low, self.observation_high, bins)
+
     def _get_observation(self):
         """Obtiene el estado observado"""
         theta1, theta2, theta_dot1, theta_dot2 = self.state
@@ -134,6 +145,7 @@ class Acrobot_Env:
 
     def render(self):
         """Dibuja el sistema usando Matplotlib"""
+        import matplotlib.pyplot as plt
         theta1, theta2, _, _ = self.state
 
         # Posiciones de los enlaces
@@ -165,14 +177,16 @@ class Acrobot_Env:
 
 # Ejemplo de uso
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
     env = Acrobot_Env(target_position=(1.5, 1.5), tolerance=0.01)
     obs = env.reset()
+    renderer = FastRenderer(env)
 
     for _ in range(200):
         action = np.random.choice([0, 1, 2])  # Acción aleatoria
-        obs, reward, done, _ = env.step(action)
-        env.render()
+        obs, reward, done = env.step(action)
+        renderer.step()
 
         if done:
             print("¡Objetivo alcanzado!")
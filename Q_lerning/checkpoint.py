@@ -0,0 +1,158 @@
+import json
+import os
+import random
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+
+# Un checkpoint es un único fichero .npz con la tabla Q, los hiperparámetros,
+# el contador de episodios, el estado de los generadores aleatorios y, en
+# las cuadrículas, la disposición del entorno (grid/lake y goal).
+
+def _layout_name(env):
+    return "lake" if hasattr(env, "lake") else "grid"
+
+def _rng_arrays(agent):
+    """Estado de random, np.random y la exploración del agente como JSON y arrays planos (sin pickle)."""
+    version, internal, gauss_next = random.getstate()
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    meta = {"random": [version, list(internal), gauss_next],
+            "numpy": [name, int(pos), int(has_gauss), float(cached_gaussian)],
+            "explorer": None}
+    arrays = {"numpy_keys": keys}
+    explorer = agent.explorer
+    if explorer is not None:
+        meta["explorer"] = {"bit_generator": explorer.rng.bit_generator.state,
+                            "block_size": explorer.block_size, "num_actions": explorer.num_actions,
+                            "index": explorer.index}
+        arrays["explorer_uniforms"] = np.array(explorer.uniforms)
+        arrays["explorer_actions"] = np.array(explorer.actions, dtype=np.int64)
+    arrays["rng"] = np.array(json.dumps(meta))
+    return arrays
+
+def _restore_rng(agent, data, restore_rng):
+    from agentesRL import ExplorationBlocks
+
+    meta = json.loads(str(data["rng"]))
+    explorer = meta["explorer"]
+    if explorer is None:
+        agent.explorer = None
+    else:
+        agent.explorer = ExplorationBlocks(None, explorer["block_size"], explorer["num_actions"])
+        agent.explorer.rng.bit_generator.state = explorer["bit_generator"]
+        agent.explorer.uniforms = data["explorer_uniforms"].tolist()
+        agent.explorer.actions = data["explorer_actions"].tolist()
+        agent.explorer.index = explorer["index"]
+    if restore_rng:
+        version, internal, gauss_next = meta["random"]
+        random.setstate((version, tuple(internal), gauss_next))
+        name, pos, has_gauss, cached_gaussian = meta["numpy"]
+        np.random.set_state((name, data["numpy_keys"], pos, has_gauss, cached_gaussian))
+
+def _file_mode():
+    """Permisos de un fichero nuevo según la umask (mkstemp crea siempre 0600)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def save_checkpoint(agent, path, compress=False):
+    """Guarda el estado de entrenamiento de ``agent`` en ``path`` de forma atómica.
+
+    Se escribe en un temporal del mismo directorio y se renombra con
+    os.replace, así que un proceso que muera a mitad deja intacto el
+    checkpoint anterior. Sin compresión, la tabla Q puede abrirse después con
+    mmap (``load_q``).
+    """
+    env = agent.env
+    data = {
+        "Q": agent.Q,
+        "alpha": agent.alpha,
+        "gamma": agent.gamma,
+        "epsilon": agent.epsilon,
+        "max_actions_per_episode": agent.max_actions_per_episode,
+        "episodes_done": agent.episodes_done,
+        **_rng_arrays(agent),
+    }
+    if hasattr(env, _layout_name(env)):  # El péndulo no tiene disposición que guardar
+        data["layout"] = getattr(env, _layout_name(env))
+        data["goal"] = np.asarray(env.goal)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            (np.savez_compressed if compress else np.savez)(f, **data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, _file_mode())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def _mmap_member(path, name):
+    """Abre con mmap un array sin comprimir de un .npz; None si está comprimido."""
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(name + ".npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, "rb") as f:
+        # Cabecera local del zip: 30 bytes fijos + nombre + campo extra
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", f.read(4))
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape,
+                     order="F" if fortran_order else "C", offset=offset)
+
+def load_q(path, mmap=True):
+    """Tabla Q de un checkpoint; de solo lectura y sin copiar si se guardó sin comprimir."""
+    Q = _mmap_member(path, "Q") if mmap else None
+    if Q is None:
+        with np.load(path) as data:
+            Q = data["Q"]
+    return Q
+
+def load_checkpoint(path, env, restore_rng=True):
+    """Reconstruye un Agent a partir de un checkpoint para seguir entrenando.
+
+    Restaura en ``env`` la disposición guardada (y recompila sus tablas) y,
+    si ``restore_rng``, el estado de ``random``, ``np.random`` y la
+    exploración del agente, de modo que el entrenamiento continúa
+    exactamente donde se detuvo.
+    """
+    from agentesRL import Agent
+
+    with np.load(path) as data:
+        if "layout" in data:
+            setattr(env, _layout_name(env), data["layout"].copy())
+            env.goal = tuple(int(x) for x in data["goal"])
+            if hasattr(env, "compile_tables"):
+                env.compile_tables()
+        agent = Agent(env, alpha=float(data["alpha"]), gamma=float(data["gamma"]),
+                      epsilon=float(data["epsilon"]))
+        agent.max_actions_per_episode = int(data["max_actions_per_episode"])
+        agent.episodes_done = int(data["episodes_done"])
+        _restore_rng(agent, data, restore_rng)
+    agent.Q = np.array(load_q(path))  # Copia escribible para seguir entrenando
+    return agent
+
+class Checkpointer:
+    """Guarda un checkpoint cada ``every`` episodios durante el entrenamiento."""
+    def __init__(self, path, every=1000, compress=False):
+        self.path = path
+        self.every = every
+        self.compress = compress
+
+    def due(self, episodes_done):
+        return episodes_done % self.every == 0
+
+    def save(self, agent):
+        save_checkpoint(agent, self.path, self.compress)
@@ -0,0 +1,79 @@
+from bisect import bisect_right
+
+import numpy as np
+
+class Discretizer:
+    """Discretiza estados continuos con puntos de corte por dimensión.
+
+    ``cuts[d]`` son los cortes crecientes de la dimensión d: el índice de un
+    valor x es el número de cortes <= x, así que la dimensión tiene
+    ``len(cuts[d]) + 1`` celdas. Un lote (N, dims) se convierte con una
+    búsqueda vectorizada por dimensión; un estado suelto usa bisect sobre
+    listas, que en escalares es mucho más rápido que NumPy.
+    """
+    def __init__(self, cuts):
+        self.cuts = [np.asarray(c, dtype=float) for c in cuts]
+        self._cut_lists = [c.tolist() for c in self.cuts]
+        self.shape = tuple(len(c) + 1 for c in self.cuts)  # Celdas por dimensión
+        self.size = int(np.prod(self.shape))  # Estados discretos (filas de la tabla Q)
+
+    @classmethod
+    def uniform(cls, low, high, bins):
+        """``bins`` celdas iguales por dimensión entre ``low`` y ``high`` (entero o uno por dimensión)."""
+        low, high = np.asarray(low, dtype=float), np.asarray(high, dtype=float)
+        bins = np.broadcast_to(bins, low.shape)
+        return cls([np.linspace(lo, hi, n + 1)[1:-1] for lo, hi, n in zip(low, high, bins)])
+
+    @classmethod
+    def quantile(cls, samples, bins):
+        """Cortes en los cuantiles de ``samples`` (N, dims): celdas con la misma población."""
+        samples = np.asarray(samples, dtype=float)
+        bins = np.broadcast_to(bins, samples.shape[1:])
+        return cls([np.unique(np.quantile(column, np.arange(1, n) / n))
+                    for column, n in zip(samples.T, bins)])
+
+    @classmethod
+    def adaptive(cls, samples, max_bins, min_samples=10):
+        """Divide por la mediana la celda más poblada de cada dimensión hasta ``max_bins`` celdas.
+
+        Una celda con menos de ``2 * min_samples`` muestras ya no se divide,
+        así que la resolución se concentra donde el agente pasa más tiempo.
+        """
+        samples = np.asarray(samples, dtype=float)
+        max_bins = np.broadcast_to(max_bins, samples.shape[1:])
+        cuts = []
+        for column, n in zip(samples.T, max_bins):
+            column = np.sort(column)
+            dim_cuts = []
+            while len(dim_cuts) + 1 < n:
+                edges = np.searchsorted(column, dim_cuts, side="left")
+                starts = np.concatenate([[0], edges])
+                counts = np.diff(np.concatenate([starts, [len(column)]]))
+                k = int(np.argmax(counts))
+                if counts[k] < 2 * min_samples:
+                    break
+                median = column[starts[k] + counts[k] // 2]
+                if median in dim_cuts or median <= column[starts[k]]:
+                    break  # Celda sin valores distintos que separar
+                dim_cuts = sorted(dim_cuts + [median])
+            cuts.append(dim_cuts)
+        return cls(cuts)
+
+    def indices(self, states):
+        """Índices por dimensión: (N, dims) para un lote, tupla de enteros para un estado."""
+        states = np.asarray(states, dtype=float)
+        if states.ndim == 1:
+            return tuple(bisect_right(c, x) for c, x in zip(self._cut_lists, states.tolist()))
+        return np.stack([np.searchsorted(c, states[:, d], side="right")
+                         for d, c in enumerate(self.cuts)], axis=1)
+
+    def flat(self, states):
+        """Índice plano en [0, size) de cada estado (orden C sobre ``shape``)."""
+        idx = self.indices(states)
+        if isinstance(idx, tuple):
+            return int(np.ravel_multi_index(idx, self.shape))
+        return np.ravel_multi_index(tuple(idx.T), self.shape)
+
+    def table_bytes(self, num_actions, dtype=np.float64):
+        """Memoria de la tabla Q (size, num_actions) que implica esta discretización."""
+        return self.size * num_actions * np.dtype(dtype).itemsize
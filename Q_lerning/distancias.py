@@ -0,0 +1,81 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from tablas import compile_moves
+
+def bfs_distances(blocked, source, moves=None):
+    """Distancia en pasos desde ``source`` a cada celda; -1 si no es alcanzable.
+
+    ``blocked`` es la máscara (height, width) de celdas en las que no se puede
+    entrar (paredes o agujeros). La búsqueda avanza por capas sobre la tabla
+    de movimientos: cada capa se expande con una sola operación vectorizada
+    sobre todas las celdas de la frontera. ``moves`` permite reutilizar una
+    tabla ya compilada con ``compile_moves(blocked)``.
+    """
+    height, width = blocked.shape
+    if moves is None:
+        moves = compile_moves(blocked)
+    dist = np.full(height * width, -1, dtype=np.int64)
+    start = source[0] * width + source[1]
+    if blocked[source]:
+        return dist.reshape(height, width)
+    dist[start] = 0
+    frontier = np.array([start])
+    depth = 0
+    while len(frontier):
+        depth += 1
+        neighbors = moves[frontier].ravel()
+        neighbors = np.unique(neighbors[dist[neighbors] < 0])
+        dist[neighbors] = depth
+        frontier = neighbors
+    return dist.reshape(height, width)
+
+class DistanceFieldCache:
+    """Caché LRU de campos de distancia BFS, uno por celda objetivo.
+
+    ``get(goal)`` devuelve el campo plano (celda = fila * width + columna)
+    de distancias en pasos hasta ``goal``; las celdas inalcanzables valen
+    ``unreachable``. Se guardan como mucho ``capacity`` campos (por defecto,
+    los que quepan en ``max_bytes``) y, al llenarse, se descarta el usado
+    hace más tiempo.
+    """
+    def __init__(self, blocked, capacity=None, unreachable=-1, moves=None, max_bytes=64 * 2**20):
+        self.blocked = blocked
+        self.width = blocked.shape[1]
+        if capacity is None:
+            capacity = max(1, max_bytes // (blocked.size * np.dtype(np.int32).itemsize))
+        self.capacity = capacity
+        self.unreachable = unreachable
+        self.moves = compile_moves(blocked) if moves is None else moves
+        self.fields = OrderedDict()  # celda objetivo plana -> campo de distancias
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, goal):
+        field = self.fields.get(goal)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(goal)
+            return field
+        self.misses += 1
+        field = bfs_distances(self.blocked, divmod(goal, self.width), self.moves).ravel()
+        field = np.where(field < 0, self.unreachable, field).astype(np.int32)
+        self.fields[goal] = field
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def memory_bytes(self):
+        return sum(field.nbytes for field in self.fields.values())
+
+    def stats(self):
+        """Aciertos, fallos, tasa de acierto, campos guardados y memoria ocupada."""
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "fields": len(self.fields), "memory_bytes": self.memory_bytes}
@@ -0,0 +1,39 @@
+import importlib
+
+# Interfaz común de los entornos:
+#   reset() -> estado
+#   step(acción) -> (estado, recompensa, fin)
+#   n_actions    número de acciones discretas
+#   state_shape  tamaño de cada componente del estado discreto (None si es continuo)
+#
+# El registro solo guarda el módulo y la clase de cada entorno: el módulo se
+# importa al pedir el entorno con make, y matplotlib al dibujar por primera
+# vez, así que un entrenamiento sin pantalla no carga nada que no use.
+
+REGISTRY = {
+    "Environment2D": ("env_2D", "Environment2D"),
+    "FrozenLakeEnvironment": ("env_frozen", "FrozenLakeEnvironment"),
+    "MazeEnvironment": ("env_maze", "MazeEnvironment"),
+    "MultiGoalEnvironment": ("env_multigoal", "MultiGoalEnvironment"),
+    "SimplePendulumEnv": ("pendulo", "SimplePendulumEnv"),
+    "BatchedPendulumEnv": ("pendulo", "BatchedPendulumEnv"),
+    "Acrobot_Env": ("brazo2dof", "Acrobot_Env"),
+}
+
+def register(name, module, cls):
+    """Añade (o sustituye) un entorno del registro."""
+    REGISTRY[name] = (module, cls)
+
+def env_class(name):
+    """Clase del entorno ``name``, importando su módulo solo ahora."""
+    if name not in REGISTRY:
+        raise ValueError("Entorno no registrado: " + str(name))
+    module, cls = REGISTRY[name]
+    return getattr(importlib.import_module(module), cls)
+
+def make(name, **kwargs):
+    """Construye el entorno ``name`` con sus argumentos."""
+    return env_class(name)(**kwargs)
+
+def names():
+    return sorted(REGISTRY)
@@ -1,8 +1,10 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import random
+from tablas import compile_grid_tables, compile_step_lookup
 
 class Environment2D:
+    n_actions = 4  # Arriba, Abajo, Izquierda, Derecha
+
     def __init__(self, width, height, obstacle_percentage=0):
         self.width = width
         self.height = height
@@ -11,6 +13,7 @@ class Environment2D:
         self.obstacle_percentage = obstacle_percentage
         self.grid = np.zeros((height, width))  # Crear una cuadrícula de 0s (sin obstáculos)
         self._generate_obstacles()  # Generar obstáculos según el porcentaje dado
+        self.compile_tables()  # La dinámica ya no cambia: precompilarla en tablas
 
     def _generate_obstacles(self):
         total_cells = self.width * self.height
@@ -27,35 +30,31 @@ class Environment2D:
         return self.state
 
     def step(self, action):
-        # Mover al agente en función de la acción
-        if action == 0:  # Arriba
-            new_state = (max(self.state[0] - 1, 0), self.state[1])
-        elif action == 1:  # Abajo
-            new_state = (min(self.state[0] + 1, self.height - 1), self.state[1])
-        elif action == 2:  # Izquierda
-            new_state = (self.state[0], max(self.state[1] - 1, 0))
-        elif action == 3:  # Derecha
-            new_state = (self.state[0], min(self.state[1] + 1, self.width - 1))
-        else:
+        if not 0 <= action <= 3:
             raise ValueError("Acción no válida")
+        # Consultar la tabla compilada: (nuevo estado, recompensa, fin del episodio)
+        self.state, reward, done = self._transitions[self.state[0] * self.width + self.state[1]][action]
+        return self.state, reward, done
 
-        # Verificar si la nueva posición es un obstáculo
-        if self.grid[new_state] == 1:
-            new_state = self.state  # Si es un obstáculo, el agente no se mueve
-
-        self.state = new_state
+    def compile_tables(self):
+        """Compila la dinámica en tablas planas next_state[s, a], reward[s, a] y done[s, a]."""
+        # Recompensa: +1 si llega al objetivo, -1 por cada paso; los obstáculos bloquean el paso
+        self.next_state_table, self.reward_table, self.done_table = compile_grid_tables(
+            self.grid == 1, self.goal, step_reward=-1, goal_reward=1)
+        self._transitions = compile_step_lookup(
+            self.next_state_table, self.reward_table, self.done_table, self.width)
 
-        # Recompensa: +1 si llega al objetivo, -1 por cada paso
-        if self.state == self.goal:
-            return self.state, 1, True  # (nuevo estado, recompensa, fin del episodio)
-        else:
-            return self.state, -1, False  # (nuevo estado, recompensa, fin del episodio)
+    @property
+    def state_shape(self):
+        """Tamaño de cada componente del estado discreto: (fila, columna)."""
+        return (self.height, self.width)
 
     def get_valid_actions(self):
         return [0, 1, 2, 3]  # Las acciones posibles: Arriba, Abajo, Izquierda, Derecha
 
     def render(self):
         """Dibuja el entorno 2D."""
+        import matplotlib.pyplot as plt
         plt.clf()  # Limpiar la figura actual
         plt.xlim(-0.5, self.width - 0.5)
         plt.ylim(-0.5, self.height - 0.5)
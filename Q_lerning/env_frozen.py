@@ -1,30 +1,42 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import random
+from distancias import bfs_distances
+from tablas import compile_grid_tables, compile_step_lookup, slip_mixture
 
 class FrozenLakeEnvironment:
-    def __init__(self, width, height, hole_prob=0.2, slippery=True, slippery_float = 0.1):
+    n_actions = 4  # Arriba, Abajo, Izquierda, Derecha
+
+    def __init__(self, width, height, hole_prob=0.2, slippery=True, slippery_float = 0.1, seed=None,
+                 max_attempts=1000):
         self.width = width
         self.height = height
         self.hole_prob = hole_prob  # Probabilidad de que una celda sea un agujero
         self.slippery = slippery  # Indica si el suelo es resbaladizo
         self.state = (0, 0)  # Posición inicial del agente
         self.goal = (height - 1, width - 1)  # Posición de la meta
+        self.seed = seed if seed is not None else random.getrandbits(32)  # Sin semilla se deriva de random
+        self.rng = np.random.default_rng(self.seed)
+        self.max_attempts = max_attempts  # Intentos para encontrar un lago con la meta alcanzable
         self.lake = self._generate_lake()  # Generar el lago (0: seguro, 1: agujero)
         self.slippery_float = slippery_float
-        
-    def _generate_lake(self):
-        """Genera un lago con agujeros aleatorios según la probabilidad dada."""
-        lake = np.zeros((self.height, self.width))
+        self.compile_tables()  # La dinámica ya no cambia: precompilarla en tablas
 
-        # Llenar el lago con agujeros aleatorios, dejando el inicio y la meta sin agujero
-        for i in range(self.height):
-            for j in range(self.width):
-                if (i, j) != (0, 0) and (i, j) != self.goal:
-                    if random.random() < self.hole_prob:
-                        lake[i, j] = 1  # Un agujero
-
-        return lake
+    def _generate_lake(self):
+        """Genera un lago con agujeros aleatorios en el que la meta es alcanzable desde el inicio.
+
+        Los agujeros se muestrean de una vez para toda la cuadrícula y se
+        vuelve a muestrear hasta que una búsqueda en anchura encuentra un
+        camino sin agujeros de (0, 0) a la meta.
+        """
+        for _ in range(self.max_attempts):
+            lake = (self.rng.random((self.height, self.width)) < self.hole_prob).astype(float)
+            # Dejar el inicio y la meta sin agujero
+            lake[0, 0] = 0
+            lake[self.goal] = 0
+            if bfs_distances(lake == 1, (0, 0))[self.goal] >= 0:
+                return lake
+        raise RuntimeError(f"No se encontró un lago resoluble en {self.max_attempts} intentos "
+                           f"(hole_prob={self.hole_prob})")
 
     def reset(self):
         """Reinicia el entorno a la posición inicial."""
@@ -37,33 +49,38 @@ class FrozenLakeEnvironment:
             if random.random() < self.slippery_float:  # Cambia la acción con un 20% de probabilidad
                 action = random.choice([0, 1, 2, 3])  # Elegir una acción aleatoria
 
-        # Obtener el nuevo estado basado en la acción
-        new_state = self._move(action)
-
-        # Verificar si el nuevo estado es un agujero
-        if self.lake[new_state] == 1:
-            return new_state, -10, True  # Fuerte penalización por caer en un agujero, termina el episodio
-
-        # Verificar si el nuevo estado es la meta
-        if new_state == self.goal:
-            return new_state, 10, True  # Recompensa por llegar a la meta, termina el episodio
-
-        # Si no es ni agujero ni meta, actualizar el estado y devolver -1 por cada paso
-        self.state = new_state
-        return self.state, -1, False  # Actualizar el estado y devolver la recompensa por el paso
-
-    def _move(self, action):
-        """Calcula el nuevo estado en función de la acción."""
-        x, y = self.state
-        if action == 0:  # Arriba
-            x = max(0, x - 1)
-        elif action == 1:  # Abajo
-            x = min(self.height - 1, x + 1)
-        elif action == 2:  # Izquierda
-            y = max(0, y - 1)
-        elif action == 3:  # Derecha
-            y = min(self.width - 1, y + 1)
-        return (x, y)
+        # Consultar la tabla compilada: agujero (-10, fin), meta (+10, fin) o paso (-1)
+        new_state, reward, done = self._transitions[self.state[0] * self.width + self.state[1]][action]
+        if not done:
+            self.state = new_state  # Solo se avanza si no es ni agujero ni meta
+        return new_state, reward, done
+
+    def compile_tables(self):
+        """Compila la dinámica en tablas planas next_state[s, a], reward[s, a] y done[s, a].
+
+        Las tablas describen la acción ya ejecutada; el resbalón se modela
+        aparte con ``slip_mixture``.
+        """
+        self.next_state_table, self.reward_table, self.done_table = compile_grid_tables(
+            np.zeros_like(self.lake, dtype=bool), self.goal, step_reward=-1, goal_reward=10,
+            holes=self.lake == 1, hole_reward=-10)
+        self._transitions = compile_step_lookup(
+            self.next_state_table, self.reward_table, self.done_table, self.width)
+        # Celdas alcanzables desde el inicio sin pasar por agujeros (los agentes pueden ignorar el resto)
+        self.reachable = bfs_distances(self.lake == 1, (0, 0)) >= 0
+
+    def reachable_states(self):
+        """Índices planos (fila * width + columna) de las celdas alcanzables."""
+        return np.flatnonzero(self.reachable)
+
+    def slip_mixture(self):
+        """Matriz M[a, b] de probabilidad de ejecutar b al elegir a (resbalón incluido)."""
+        return slip_mixture(self.slippery_float if self.slippery else 0.0)
+
+    @property
+    def state_shape(self):
+        """Tamaño de cada componente del estado discreto: (fila, columna)."""
+        return (self.height, self.width)
 
     def get_valid_actions(self):
         """Devuelve las acciones válidas: arriba, abajo, izquierda, derecha."""
@@ -71,6 +88,7 @@ class FrozenLakeEnvironment:
 
     def render(self):
         """Dibuja el entorno del lago congelado."""
+        import matplotlib.pyplot as plt
         plt.clf()
         plt.xlim(-0.5, self.width - 0.5)
         plt.ylim(-0.5, self.height - 0.5)
@@ -1,49 +1,25 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import random
+from laberinto import generate_maze, maze_seed
+from tablas import compile_grid_tables, compile_step_lookup
 
 class MazeEnvironment:
-    def __init__(self, width, height):
+    n_actions = 4  # Arriba, Abajo, Izquierda, Derecha
+
+    def __init__(self, width, height, seed=None, algorithm="prim", cache_dir=None):
         self.width = width
         self.height = height
         self.state = (0, 0)  # Posición inicial del agente
         self.goal = (height // 2, width // 2)  # Posición del objetivo (centro del laberinto)
-        self.grid = np.ones((height, width))  # Crear una cuadrícula llena de paredes (1)
+        self.seed = maze_seed(seed)  # Sin semilla se deriva de random, así respeta random.seed
+        self.algorithm = algorithm  # Algoritmo de generación (ver laberinto.ALGORITHMS)
+        self.cache_dir = cache_dir  # Directorio de la caché de laberintos (None: sin caché)
         self._generate_maze()  # Generar el laberinto con el algoritmo de Prim
+        self.compile_tables()  # La dinámica ya no cambia: precompilarla en tablas
 
     def _generate_maze(self):
-        """Genera un laberinto utilizando el algoritmo de Prim."""
-        def neighbors(x, y):
-            """Devuelve las celdas vecinas que están dentro del laberinto."""
-            directions = [(2, 0), (-2, 0), (0, 2), (0, -2)]
-            result = []
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.height and 0 <= ny < self.width:
-                    result.append((nx, ny))
-            return result
-
-        # Iniciar desde la posición (1, 1) para evitar los bordes del laberinto
-        self.grid[1, 1] = 0
-        frontier = neighbors(1, 1)
-
-        while frontier:
-            # Escoger una celda aleatoria de la frontera
-            cx, cy = random.choice(frontier)
-            frontier.remove((cx, cy))
-
-            # Escoger una vecina de la celda que ya forme parte del laberinto
-            valid_neighbors = [n for n in neighbors(cx, cy) if self.grid[n] == 0]
-            if valid_neighbors:
-                nx, ny = random.choice(valid_neighbors)
-
-                # Conectar la celda actual con la vecina
-                wx, wy = (cx + nx) // 2, (cy + ny) // 2
-                self.grid[cx, cy] = 0
-                self.grid[wx, wy] = 0
-
-                # Añadir las celdas vecinas de la nueva celda a la frontera
-                frontier.extend([n for n in neighbors(cx, cy) if self.grid[n] == 1])
+        """Genera el laberinto (Prim por defecto) con semilla y caché en disco opcional."""
+        self.grid = generate_maze(self.width, self.height, self.algorithm, self.seed,
+                                  self.cache_dir).astype(float)
 
         # Asegurar que el punto inicial y el objetivo están libres
         self.grid[0, 0] = 0  # Liberar la posición inicial del agente
@@ -58,28 +34,24 @@ class MazeEnvironment:
 
     def step(self, action):
         """Mueve al agente en la dirección especificada."""
-        if action == 0:  # Arriba
-            new_state = (max(self.state[0] - 1, 0), self.state[1])
-        elif action == 1:  # Abajo
-            new_state = (min(self.state[0] + 1, self.height - 1), self.state[1])
-        elif action == 2:  # Izquierda
-            new_state = (self.state[0], max(self.state[1] - 1, 0))
-        elif action == 3:  # Derecha
-            new_state = (self.state[0], min(self.state[1] + 1, self.width - 1))
-        else:
+        if not 0 <= action <= 3:
             raise ValueError("Acción no válida")
-
-        # Verificar si la nueva posición es una pared
-        if self.grid[new_state] == 1:
-            new_state = self.state  # Si hay una pared, no se mueve
-
-        self.state = new_state
-
-        # Recompensa: +1 si llega al objetivo, -1 por cada paso
-        if self.state == self.goal:
-            return self.state, 10, True  # (nuevo estado, recompensa, fin del episodio)
-        else:
-            return self.state, -1, False  # (nuevo estado, recompensa, fin del episodio)
+        # Consultar la tabla compilada: (nuevo estado, recompensa, fin del episodio)
+        self.state, reward, done = self._transitions[self.state[0] * self.width + self.state[1]][action]
+        return self.state, reward, done
+
+    def compile_tables(self):
+        """Compila la dinámica en tablas planas next_state[s, a], reward[s, a] y done[s, a]."""
+        # Recompensa: +10 si llega al objetivo, -1 por cada paso; las paredes bloquean el paso
+        self.next_state_table, self.reward_table, self.done_table = compile_grid_tables(
+            self.grid == 1, self.goal, step_reward=-1, goal_reward=10)
+        self._transitions = compile_step_lookup(
+            self.next_state_table, self.reward_table, self.done_table, self.width)
+
+    @property
+    def state_shape(self):
+        """Tamaño de cada componente del estado discreto: (fila, columna)."""
+        return (self.height, self.width)
 
     def get_valid_actions(self):
         """Devuelve las acciones válidas: Arriba, Abajo, Izquierda, Derecha."""
@@ -87,6 +59,7 @@ class MazeEnvironment:
 
     def render(self):
         """Dibuja el entorno del laberinto."""
+        import matplotlib.pyplot as plt
         plt.clf()  # Limpiar la figura actual
         plt.xlim(-0.5, self.width - 0.5)
         plt.ylim(-0.5, self.height - 0.5)
@@ -1,51 +1,29 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import random
-import math
+from laberinto import generate_maze, maze_seed
+from tablas import compile_moves
+from distancias import DistanceFieldCache
 
 class MultiGoalEnvironment:
-    def __init__(self, width, height):
+    n_actions = 4  # Arriba, Abajo, Izquierda, Derecha
+
+    def __init__(self, width, height, seed=None, algorithm="prim", cache_dir=None, distance_cache_size=None):
         self.width = width
         self.height = height
         self.goal = (random.randint(0,width-1) , random.randint(0,height-1))  # Posición del objetivo (centro del laberinto)
         self.pos = (random.randint(0,self.height-1) , random.randint(0,self.width-1))
         self.state = ((self.pos[0]+ self.width * self.pos[1]), self.goal[0] * self.width + self.goal[1]) # Posición inicial del agente
-        self.grid = np.ones((height, width))  # Crear una cuadrícula llena de paredes (1)
+        self.seed = maze_seed(seed)  # Sin semilla se deriva de random, así respeta random.seed
+        self.algorithm = algorithm  # Algoritmo de generación (ver laberinto.ALGORITHMS)
+        self.cache_dir = cache_dir  # Directorio de la caché de laberintos (None: sin caché)
+        self.distance_cache_size = distance_cache_size  # Campos de distancia BFS guardados (None: los que quepan en 64 MB)
         self._generate_maze()  # Generar el laberinto con el algoritmo de Prim
+        self.compile_tables()  # Las paredes ya no cambian: precompilar los movimientos
 
     def _generate_maze(self):
-        """Genera un laberinto utilizando el algoritmo de Prim."""
-        def neighbors(x, y):
-            """Devuelve las celdas vecinas que están dentro del laberinto."""
-            directions = [(2, 0), (-2, 0), (0, 2), (0, -2)]
-            result = []
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.height and 0 <= ny < self.width:
-                    result.append((nx, ny))
-            return result
-
-        # Iniciar desde la posición (1, 1) para evitar los bordes del laberinto
-        self.grid[1, 1] = 0
-        frontier = neighbors(1, 1)
-
-        while frontier:
-            # Escoger una celda aleatoria de la frontera
-            cx, cy = random.choice(frontier)
-            frontier.remove((cx, cy))
-
-            # Escoger una vecina de la celda que ya forme parte del laberinto
-            valid_neighbors = [n for n in neighbors(cx, cy) if self.grid[n] == 0]
-            if valid_neighbors:
-                nx, ny = random.choice(valid_neighbors)
-
-                # Conectar la celda actual con la vecina
-                wx, wy = (cx + nx) // 2, (cy + ny) // 2
-                self.grid[cx, cy] = 0
-                self.grid[wx, wy] = 0
-
-                # Añadir las celdas vecinas de la nueva celda a la frontera
-                frontier.extend([n for n in neighbors(cx, cy) if self.grid[n] == 1])
+        """Genera el laberinto (Prim por defecto) con semilla y caché en disco opcional."""
+        self.grid = generate_maze(self.width, self.height, self.algorithm, self.seed,
+                                  self.cache_dir).astype(float)
 
         # Asegurar que el punto inicial y el objetivo están libres
         self.grid[self.pos] = 0  # Liberar la posición inicial del agente
@@ -59,6 +37,7 @@ class MultiGoalEnvironment:
         self.state = ((random.randint(0,self.height-1)+ self.width * random.randint(0,self.width-1)), self.goal[0] * self.width + self.goal[1])  # Reiniciar el estado del agente
         while self.grid[self.get_grid(self.state)] == 1:
             self.state = ((random.randint(0,self.height-1)+ self.width * random.randint(0,self.width-1)), self.goal[0] * self.width + self.goal[1])
+        self._goal_distances(self.goal)  # Tener listo el campo de distancias del nuevo objetivo
         # print("estado inicial: ", self.state)
         return self.state
 
@@ -70,34 +49,54 @@ class MultiGoalEnvironment:
         # print("accion: ", action)
         # print("objetivo: ", self.goal)
         
-        if action == 0:  # Arriba
-            new_i, new_j = max(i - 1, 0), j
-        elif action == 1:  # Abajo
-            new_i, new_j = min(i + 1, self.height - 1), j
-        elif action == 2:  # Izquierda
-            new_i, new_j = i, max(j - 1, 0)
-        elif action == 3:  # Derecha
-            new_i, new_j = i, min(j + 1, self.width - 1)
-        else:
+        if not 0 <= action <= 3:
             raise ValueError("Acción no válida")
-    
-        # Verificar si la nueva posición es una pared
-        if self.grid[new_i, new_j] == 1:
-            new_i, new_j = i, j  # Si hay una pared, no se mueve
+        # Consultar la tabla compilada (las paredes y los bordes ya están resueltos)
+        new_i, new_j = divmod(self.next_cell_table.item(i * self.width + j, action), self.width)
     
         self.state = (new_i + new_j* self.width , self.state[1])
         # print("Valor de la celda: ",new_i," ,",new_j," ", self.grid[new_i, new_j])
         # print("nuevo estado: ", new_i, new_j)
     
-        # Recompensa: +1 si llega al objetivo, -1 por cada paso
-        distance = math.dist((new_i, new_j), self.goal)
-        # print("distancia: ", distance)
-        if (new_i, new_j) == self.goal:
-            # print("Llego al objetivo ", new_i, new_j, self.goal)
-            return self.state, 10, True  # (nuevo estado, recompensa, fin del episodio)
-        else:
-            if distance != 0:
-                return self.state, -distance, False  # (nuevo estado, recompensa, fin del episodio))
+        reward, done = self.compute_reward((new_i, new_j), self.goal)
+        return self.state, reward, done  # (nuevo estado, recompensa, fin del episodio)
+
+    def compute_reward(self, cell, goal):
+        """Recompensa y fin de episodio al llegar a ``cell`` persiguiendo ``goal``."""
+        # Recompensa: +10 si llega al objetivo, menos la distancia BFS (en pasos, rodeando paredes) en otro caso
+        if cell == goal:
+            return 10, True
+        return -float(self._goal_distances(goal)[cell[0] * self.width + cell[1]]), False
+
+    def compute_rewards(self, cells, goals):
+        """Versión vectorizada de compute_reward para arrays de celdas y objetivos planos (fila * width + columna)."""
+        distance = np.empty(len(cells))
+        for goal in np.unique(goals).tolist():
+            mask = goals == goal
+            distance[mask] = self.distances.get(goal)[cells[mask]]
+        done = cells == goals
+        return np.where(done, 10.0, -distance), done
+
+    def _goal_distances(self, goal):
+        """Campo de distancias hasta ``goal``; el del último objetivo se guarda a mano para no tocar la caché."""
+        if goal != self._field_goal:
+            self._field = self.distances.get(goal[0] * self.width + goal[1])
+            self._field_goal = goal
+        return self._field
+
+    def compile_tables(self):
+        """Compila los movimientos en la tabla plana next_cell[c, a] (c = fila * width + columna)."""
+        self.next_cell_table = compile_moves(self.grid == 1)
+        # Distancias BFS por objetivo; las celdas inalcanzables cuentan como el área de la cuadrícula
+        self.distances = DistanceFieldCache(self.grid == 1, self.distance_cache_size,
+                                            unreachable=self.width * self.height, moves=self.next_cell_table)
+        self._field_goal = None
+
+    @property
+    def state_shape(self):
+        """Tamaño de cada componente del estado discreto: (celda del agente, celda del objetivo)."""
+        cells = self.width * self.height
+        return (cells, cells)
 
     def get_valid_actions(self):
         """Devuelve las acciones válidas: Arriba, Abajo, Izquierda, Derecha."""
@@ -105,6 +104,7 @@ class MultiGoalEnvironment:
 
     def render(self):
         """Dibuja el entorno del laberinto."""
+        import matplotlib.pyplot as plt
         plt.clf()  # Limpiar la figura actual
         plt.xlim(-0.5, self.width - 0.5)
         plt.ylim(-0.5, self.height - 0.5)
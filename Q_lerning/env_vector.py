@@ -0,0 +1,53 @@
+import numpy as np
+
+class VectorGridEnv:
+    """N copias de un entorno de cuadrícula que avanzan con una sola llamada de NumPy.
+
+    Usa las tablas compiladas del entorno (``next_state_table``,
+    ``reward_table``, ``done_table``), así que cada paso es una consulta
+    indexada por carril. Los estados se representan como índices planos
+    ``fila * width + columna``. Los carriles que terminan se reinician solos:
+    ``step`` devuelve el estado alcanzado y ``self.states`` ya contiene el
+    estado inicial del nuevo episodio.
+    """
+    def __init__(self, env, num_envs, seed=None):
+        self.width = env.width
+        self.height = env.height
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+
+        self.next_state_table = env.next_state_table
+        self.reward_table = env.reward_table
+        self.done_table = env.done_table
+        self.slip = env.slippery_float if getattr(env, "slippery", False) else 0.0
+
+        self.start = 0  # Todos los entornos empiezan en (0, 0)
+        self.states = np.full(num_envs, self.start, dtype=np.int64)
+
+    def reset(self, mask=None):
+        """Reinicia todos los carriles, o solo los marcados en ``mask``."""
+        if mask is None:
+            self.states[:] = self.start
+        else:
+            self.states[mask] = self.start
+        return self.states
+
+    def step(self, actions):
+        """Aplica un array de acciones y devuelve (estados, recompensas, fin) por carril."""
+        actions = np.asarray(actions)
+        if self.slip > 0:
+            # Mismo modelo que FrozenLakeEnvironment: con probabilidad slip la acción es aleatoria
+            slipped = self.rng.random(self.num_envs) < self.slip
+            actions = np.where(slipped, self.rng.integers(0, 4, self.num_envs), actions)
+
+        next_states = self.next_state_table[self.states, actions]
+        rewards = self.reward_table[self.states, actions]
+        dones = self.done_table[self.states, actions]
+
+        # Reinicio automático de los carriles que han terminado
+        self.states = np.where(dones, self.start, next_states)
+        return next_states, rewards, dones
+
+    def to_grid(self, states):
+        """Convierte índices planos en arrays (filas, columnas)."""
+        return np.divmod(states, self.width)
@@ -0,0 +1,129 @@
+import numpy as np
+
+class RewardTracker:
+    """Estadísticas de entrenamiento en línea con coste O(1) por episodio.
+
+    Guarda recompensa, longitud y éxito de cada episodio en arrays
+    reservados de antemano (que doblan su tamaño si se llenan) y mantiene
+    las sumas de la ventana de los últimos ``window`` episodios, de modo que
+    la media y la varianza móviles están disponibles en todo momento sin
+    recorrer la historia.
+    """
+    def __init__(self, capacity=1024, window=100):
+        self.window = window
+        self.count = 0
+        self.rewards = np.zeros(capacity)
+        self.lengths = np.zeros(capacity, dtype=np.int64)
+        self.successes = np.zeros(capacity, dtype=bool)
+        self.means = np.zeros(capacity)  # Media móvil al final de cada episodio
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._length_sum = 0
+        self._success_sum = 0
+
+    def _grow(self):
+        for name in ("rewards", "lengths", "successes", "means"):
+            old = getattr(self, name)
+            new = np.zeros(2 * len(old), dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def update(self, reward, length=0, success=False):
+        """Añade un episodio terminado."""
+        i = self.count
+        if i == len(self.rewards):
+            self._grow()
+        self.rewards[i] = reward
+        self.lengths[i] = length
+        self.successes[i] = success
+        reward = float(reward)
+        self._sum += reward
+        self._sum_sq += reward * reward
+        self._length_sum += int(length)
+        self._success_sum += bool(success)
+        if i >= self.window:  # Sale de la ventana el episodio i - window
+            old = float(self.rewards[i - self.window])
+            self._sum -= old
+            self._sum_sq -= old * old
+            self._length_sum -= int(self.lengths[i - self.window])
+            self._success_sum -= bool(self.successes[i - self.window])
+        self.count = i + 1
+        self.means[i] = self.mean
+
+    @property
+    def size(self):
+        """Episodios dentro de la ventana."""
+        return min(self.count, self.window)
+
+    @property
+    def mean(self):
+        return self._sum / self.size if self.count else 0.0
+
+    @property
+    def variance(self):
+        if not self.count:
+            return 0.0
+        mean = self.mean
+        return max(self._sum_sq / self.size - mean * mean, 0.0)
+
+    @property
+    def success_rate(self):
+        return self._success_sum / self.size if self.count else 0.0
+
+    @property
+    def mean_length(self):
+        return self._length_sum / self.size if self.count else 0.0
+
+    def moving_average(self):
+        """Medias de ventanas completas; igual que np.convolve(recompensas, ones(w) / w, 'valid')."""
+        return self.means[self.window - 1:self.count]
+
+    def summary(self):
+        return {"episodes": self.count, "mean": self.mean, "variance": self.variance,
+                "success_rate": self.success_rate, "mean_length": self.mean_length}
+
+# Criterios de parada: ``criterion(agent, tracker)`` devuelve True para parar.
+# Los bucles de entrenamiento solo lo llaman cuando ``criterion.due(episodios)``.
+
+class RewardPlateau:
+    """Para cuando la media móvil no mejora más de ``min_delta`` en ``patience`` episodios."""
+    uses_q = False
+
+    def __init__(self, patience=500, min_delta=1e-3):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.best = -np.inf
+        self.best_episode = 0
+
+    def due(self, episodes):
+        return True
+
+    def __call__(self, agent, tracker):
+        if tracker.count < tracker.window:
+            return False  # Aún no hay una ventana completa
+        if tracker.mean > self.best + self.min_delta:
+            self.best = tracker.mean
+            self.best_episode = tracker.count
+        return tracker.count - self.best_episode >= self.patience
+
+class StableGreedyPolicy:
+    """Para cuando la acción voraz de todos los estados no cambia en ``patience`` comprobaciones seguidas."""
+    uses_q = True
+
+    def __init__(self, patience=5, check_every=100):
+        self.patience = patience
+        self.check_every = check_every
+        self.policy = None
+        self.stable = 0
+
+    def due(self, episodes):
+        return episodes % self.check_every == 0
+
+    def __call__(self, agent, tracker):
+        policy = np.argmax(agent.Q, axis=-1)
+        if self.policy is not None and np.array_equal(policy, self.policy):
+            self.stable += 1
+        else:
+            self.stable = 0
+        self.policy = policy
+        return self.stable >= self.patience
@@ -0,0 +1,69 @@
+import numpy as np
+
+def compile_greedy_policy(Q):
+    """Acción voraz de cada estado plano: array (S,) con argmax de Q (mismo desempate que np.argmax)."""
+    return np.argmax(Q.reshape(-1, Q.shape[-1]), axis=1)
+
+def rollout_policy(env, policy, num_rollouts=10000, max_steps=None, seed=None):
+    """Ejecuta ``num_rollouts`` episodios de ``policy`` a la vez sobre las tablas compiladas de ``env``.
+
+    No hay reinicio automático: cada carril juega un único episodio desde
+    el estado inicial y deja de avanzar al terminar o al llegar a
+    ``max_steps`` pasos (por defecto, el número de celdas). Solo se simulan
+    los carriles todavía activos. Los resbalones de FrozenLake se muestrean
+    como en el entorno. Devuelve (returns, steps, successes, truncated) por
+    carril; un éxito es terminar con recompensa positiva (llegar a la meta).
+    """
+    if not hasattr(env, "next_state_table"):
+        raise ValueError("El entorno no tiene tablas compiladas")
+    rng = np.random.default_rng(seed)
+    width = env.width
+    if max_steps is None:
+        max_steps = env.width * env.height
+    slip = env.slippery_float if getattr(env, "slippery", False) else 0.0
+    next_state_table, reward_table, done_table = env.next_state_table, env.reward_table, env.done_table
+
+    start = env.reset()
+    returns = np.zeros(num_rollouts)
+    steps = np.zeros(num_rollouts, dtype=np.int64)
+    successes = np.zeros(num_rollouts, dtype=bool)
+    lanes = np.arange(num_rollouts)  # Carriles activos
+    states = np.full(num_rollouts, start[0] * width + start[1], dtype=np.int64)
+
+    for _ in range(max_steps):
+        if not len(lanes):
+            break
+        actions = policy[states]
+        if slip > 0:
+            slipped = rng.random(len(lanes)) < slip
+            actions = np.where(slipped, rng.integers(0, 4, len(lanes)), actions)
+        rewards = reward_table[states, actions]
+        dones = done_table[states, actions]
+        states = next_state_table[states, actions]
+        returns[lanes] += rewards
+        steps[lanes] += 1
+        successes[lanes[dones]] = rewards[dones] > 0
+        lanes, states = lanes[~dones], states[~dones]
+
+    truncated = np.zeros(num_rollouts, dtype=bool)
+    truncated[lanes] = True
+    return returns, steps, successes, truncated
+
+def evaluate_greedy(env, Q, num_rollouts=10000, max_steps=None, seed=None):
+    """Evalúa la política voraz de ``Q`` sin exploración ni renderizado.
+
+    Devuelve tasa de éxito, retorno medio y su desviación, y la
+    distribución del número de pasos (media, percentiles e histograma).
+    """
+    returns, steps, successes, truncated = rollout_policy(env, compile_greedy_policy(Q),
+                                                          num_rollouts, max_steps, seed)
+    return {
+        "rollouts": num_rollouts,
+        "success_rate": float(successes.mean()),
+        "truncated_rate": float(truncated.mean()),
+        "mean_return": float(returns.mean()),
+        "std_return": float(returns.std()),
+        "mean_steps": float(steps.mean()),
+        "steps_percentiles": dict(zip(("p50", "p90", "p99"), np.percentile(steps, [50, 90, 99]).tolist())),
+        "steps_histogram": np.bincount(steps).tolist(),  # Rollouts que duraron k pasos
+    }
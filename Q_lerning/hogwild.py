@@ -0,0 +1,97 @@
+import contextlib
+import os
+import random
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from instrumentacion import unwrap_env
+
+def _init_worker():
+    """Backend sin ventanas en cada proceso de entrenamiento."""
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+def _attach(name, shape):
+    """Abre la tabla Q compartida creada por el proceso principal (que es quien la libera)."""
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+def _train(Q, env, params, seed, num_episodes, algorithm):
+    """Entrena episodios contra una copia propia del entorno escribiendo en Q sin bloqueos."""
+    from agentesRL import Agent
+
+    random.seed(seed)
+    agent = Agent(env, seed=seed if params.pop("seeded") else None, **params)
+    agent.Q = Q  # Las actualizaciones van directas a la memoria compartida
+    with contextlib.redirect_stdout(None):
+        if algorithm == "q_learning":
+            rewards = agent.train_q_learning(num_episodes)
+        elif algorithm == "sarsa":
+            rewards = agent.train_sarsa(num_episodes)
+        else:
+            raise ValueError("Algoritmo no válido")
+    return np.asarray(rewards, dtype=np.float32)
+
+def _worker(name, shape, env, params, seed, num_episodes, algorithm):
+    shm, Q = _attach(name, shape)
+    try:
+        return _train(Q, env, params, seed, num_episodes, algorithm)
+    except BaseException as e:
+        # El traceback mantiene vivo el marco de _train y con él su vista de Q
+        traceback.clear_frames(e.__traceback__)
+        raise
+    finally:
+        del Q  # Soltar la vista antes de cerrar el segmento
+        shm.close()
+
+def train_hogwild(agent, num_episodes, num_workers=None, algorithm="q_learning", seed=0):
+    """Entrenamiento asíncrono estilo Hogwild sobre una tabla Q en memoria compartida.
+
+    Los ``num_episodes`` se reparten entre ``num_workers`` procesos; cada uno
+    entrena con su copia del entorno de ``agent`` (misma disposición) y
+    actualiza la tabla compartida sin bloqueos. Al terminar, la tabla se
+    copia en ``agent.Q``. Devuelve un diccionario con las recompensas de cada
+    proceso, el total de episodios y el tiempo real.
+    """
+    num_workers = num_workers or os.cpu_count()
+    shape = agent.Q.shape
+    env = unwrap_env(agent.env)  # Sin el proxy de Instrumentation, que no se puede serializar
+    params = {"alpha": agent.alpha, "gamma": agent.gamma, "epsilon": agent.epsilon,
+              "seeded": agent.explorer is not None}
+    # Reparto de episodios lo más equilibrado posible
+    episodes = [num_episodes // num_workers + (i < num_episodes % num_workers) for i in range(num_workers)]
+
+    shm = shared_memory.SharedMemory(create=True, size=agent.Q.nbytes)
+    Q = None
+    try:
+        Q = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        Q[:] = agent.Q  # Partir de lo que el agente ya haya aprendido
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_worker, shm.name, shape, env, dict(params), seed + i, n, algorithm)
+                       for i, n in enumerate(episodes) if n > 0]
+            rewards = [future.result() for future in futures]
+        wall = time.perf_counter() - start
+        agent.Q[:] = Q
+    finally:
+        del Q  # También si falla un proceso: con la vista viva, close() lanzaría BufferError
+        shm.close()
+        shm.unlink()
+
+    return {
+        "rewards": rewards,
+        "episodes": int(sum(len(r) for r in rewards)),
+        "workers": len(rewards),
+        "wall_seconds": wall,
+    }
+
+if __name__ == "__main__":
+    from agentesRL import Agent
+    from env_maze import MazeEnvironment
+
+    agent = Agent(MazeEnvironment(201, 201))
+    stats = train_hogwild(agent, num_episodes=8)
+    print(f"{stats['episodes']} episodios en {stats['workers']} procesos: {stats['wall_seconds']:.1f} s")
@@ -0,0 +1,156 @@
+import csv
+import json
+import time
+
+class Instrumentation:
+    """Tiempos por fase, contadores y callbacks de fin de episodio para un Agent.
+
+    ``attach`` envuelve en la instancia ``agent.choose_action`` y
+    ``renderer.step`` y sustituye ``agent.env`` por un proxy que mide
+    ``step`` (el entorno puede estar compartido, así que no se modifica),
+    de modo que los bucles de entrenamiento no cambian y, sin
+    instrumentación, no pagan nada. Los bucles sobre Q en listas miden su
+    política con ``wrap``. El tiempo de actualización de Q es el que pasa
+    entre el final de un ``env.step`` y el inicio del siguiente (o el final
+    del episodio), descontando la decisión y el renderizado, así que vale
+    igual para Q-learning que para SARSA. ``train_fast`` sobre tablas
+    compiladas no llama a ``env.step``: de él se cuentan episodios, pasos,
+    truncamientos y decisiones, pero no los tiempos de paso y actualización.
+    """
+    PHASES = ("choose_action", "env_step", "update", "render")
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.seconds = dict.fromkeys(self.PHASES, 0.0)
+        self.steps = 0
+        self.episodes = 0
+        self.truncations = 0  # Episodios cortados por max_actions_per_episode
+        self.callbacks = []
+        self.rows = []  # Una fila por episodio: (episodio, recompensa, pasos, truncado, segundos)
+        self.agent = None
+        self._reset_episode()
+
+    def _reset_episode(self):
+        self._episode_start = self.clock()
+        self._episode_steps = 0
+        self._last_done = False
+        self._step_end = None  # Final del último env.step pendiente de contar como actualización
+        self._excluded = 0.0  # Decisión y renderizado dentro de ese intervalo
+
+    def add_callback(self, callback):
+        """Registra ``callback(agent, row)`` para el final de cada episodio; ``row`` es un dict."""
+        self.callbacks.append(callback)
+
+    def _close_update(self, now):
+        if self._step_end is not None:
+            self.seconds["update"] += now - self._step_end - self._excluded
+            self._step_end = None
+        self._excluded = 0.0
+
+    def wrap(self, fn, phase):
+        """Devuelve ``fn`` midiendo su tiempo en ``phase`` ("choose_action" o "render")."""
+        clock = self.clock
+        seconds = self.seconds
+
+        def timed(*args):
+            start = clock()
+            result = fn(*args)
+            elapsed = clock() - start
+            seconds[phase] += elapsed
+            self._excluded += elapsed
+            return result
+        return timed
+
+    def _step(self, env, action):
+        start = self.clock()
+        self._close_update(start)
+        result = env.step(action)
+        self._step_end = end = self.clock()
+        self.seconds["env_step"] += end - start
+        self.steps += 1
+        self._episode_steps += 1
+        self._last_done = result[2]
+        return result
+
+    def attach(self, agent):
+        """Empieza a medir ``agent``; devuelve self."""
+        agent.choose_action = self.wrap(agent.choose_action, "choose_action")
+        agent.renderer.step = self.wrap(agent.renderer.step, "render")
+        agent.env = _TimedEnv(agent.env, self)
+        agent.instrumentation = self
+        self.agent = agent
+        self._reset_episode()
+        return self
+
+    def detach(self):
+        """Deja de medir y restaura el entorno y los métodos originales."""
+        agent = self.agent
+        if agent is None:
+            return
+        agent.__dict__.pop("choose_action", None)
+        agent.renderer.__dict__.pop("step", None)
+        agent.env = agent.env._env
+        agent.instrumentation = None
+        self.agent = None
+
+    def end_episode(self, agent, total_reward, steps=None, done=None):
+        """Llamado por Agent al terminar cada episodio; ``steps`` y ``done`` si no pasó por env.step."""
+        now = self.clock()
+        self._close_update(now)
+        if steps is not None:
+            self.steps += steps - self._episode_steps
+            self._episode_steps, self._last_done = steps, done
+        truncated = not self._last_done and self._episode_steps >= agent.max_actions_per_episode
+        self.truncations += truncated
+        row = {"episode": self.episodes, "reward": total_reward, "steps": self._episode_steps,
+               "truncated": truncated, "seconds": now - self._episode_start}
+        self.rows.append(row)
+        self.episodes += 1
+        for callback in self.callbacks:
+            callback(agent, row)
+        self._reset_episode()
+
+    def summary(self):
+        """Totales por fase, contadores y coste medio por paso."""
+        return {
+            "seconds": dict(self.seconds),
+            "steps": self.steps,
+            "episodes": self.episodes,
+            "truncations": self.truncations,
+            "microseconds_per_step": {phase: 1e6 * s / self.steps if self.steps else 0.0
+                                      for phase, s in self.seconds.items()},
+        }
+
+    def to_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), "episodes": self.rows}, f, indent=2)
+
+    def to_csv(self, path):
+        """Una fila por episodio."""
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["episode", "reward", "steps", "truncated", "seconds"])
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+def unwrap_env(env):
+    """Entorno real detrás del proxy que instala ``attach`` (o ``env`` si no lo es).
+
+    Lo usan quienes copian o inspeccionan el entorno (VectorGridEnv, los
+    procesos de hogwild): el proxy no se puede serializar.
+    """
+    return env._env if isinstance(env, _TimedEnv) else env
+
+class _TimedEnv:
+    """Proxy de un entorno que mide ``step``; el resto de atributos (también al asignarlos) van al entorno."""
+    def __init__(self, env, instrumentation):
+        object.__setattr__(self, "_env", env)
+        object.__setattr__(self, "_instrumentation", instrumentation)
+
+    def __getattr__(self, name):
+        return getattr(self._env, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._env, name, value)
+
+    def step(self, action):
+        return self._instrumentation._step(self._env, action)
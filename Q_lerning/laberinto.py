@@ -0,0 +1,168 @@
+import os
+import random
+import tempfile
+
+import numpy as np
+
+# Generación de laberintos sobre una cuadrícula (1 = pared, 0 = pasillo).
+# Las celdas del laberinto son las de coordenadas impares alcanzables desde
+# (1, 1) a saltos de 2, como en el algoritmo original de los entornos. Los
+# algoritmos trabajan en el espacio de celdas, aplanado y con un borde de
+# centinelas para no comprobar límites, y al final se tallan las paredes en
+# la cuadrícula con una sola operación vectorizada.
+
+UNVISITED, FRONTIER, IN_MAZE, BORDER = 0, 1, 2, 3
+# Desplazamiento (fila, columna) de cada dirección: Arriba, Abajo, Izquierda, Derecha
+DIRECTIONS = np.array([[-1, 0], [1, 0], [0, -1], [0, 1]])
+
+def _cell_space(width, height):
+    """Estado plano de las celdas con borde de centinelas; devuelve (state, stride)."""
+    rows, cols = height // 2, width // 2
+    stride = cols + 2
+    state = np.full((rows + 2, stride), BORDER, dtype=np.uint8)
+    state[1:-1, 1:-1] = UNVISITED
+    return bytearray(state.tobytes()), stride
+
+def _to_grid(width, height, state, link, stride, start):
+    """Talla en la cuadrícula las celdas del laberinto y la pared hacia su celda de origen."""
+    rows = height // 2
+    state = np.frombuffer(bytes(state), dtype=np.uint8).reshape(rows + 2, stride)[1:-1, 1:-1]
+    link = np.frombuffer(bytes(link), dtype=np.uint8).reshape(rows + 2, stride)[1:-1, 1:-1]
+    grid = np.ones((height, width), dtype=np.uint8)
+    r, c = np.nonzero(state == IN_MAZE)
+    grid[2 * r + 1, 2 * c + 1] = 0
+    linked = (r * stride + c) != (start - stride - 1)  # La celda inicial no tiene origen
+    r, c = r[linked], c[linked]
+    d = DIRECTIONS[link[r, c]]
+    grid[2 * r + 1 + d[:, 0], 2 * c + 1 + d[:, 1]] = 0
+    return grid
+
+def prim_maze(width, height, seed=None):
+    """Algoritmo de Prim aleatorio con frontera en array y extracción O(1).
+
+    La frontera es una lista en la que se extrae un elemento aleatorio
+    intercambiándolo con el último, y el estado de cada celda evita
+    duplicados.
+    """
+    rng = np.random.default_rng(seed)
+    state, stride = _cell_space(width, height)
+    link = bytearray(len(state))  # Dirección hacia la celda con la que se conectó
+    block = min(65536, len(state))
+    frontier = []
+    picks = links = []
+    used = 0
+
+    start = stride + 1  # Celda (1, 1) para evitar los bordes
+    state[start] = IN_MAZE
+    for n in (start - stride, start + stride, start - 1, start + 1):
+        if state[n] == UNVISITED:
+            state[n] = FRONTIER
+            frontier.append(n)
+
+    while frontier:
+        if used == len(picks):
+            # Aleatorios por bloques: uno para la celda de la frontera y otro para la conexión
+            picks, links = rng.random(block).tolist(), rng.random(block).tolist()
+            used = 0
+        # Extraer una celda aleatoria de la frontera en O(1)
+        k = int(picks[used] * len(frontier))
+        last = frontier.pop()
+        if k < len(frontier):
+            cell = frontier[k]
+            frontier[k] = last
+        else:
+            cell = last
+
+        # Conectarla con una vecina que ya forme parte del laberinto
+        up, down, left, right = cell - stride, cell + stride, cell - 1, cell + 1
+        connected = []
+        if state[up] == IN_MAZE: connected.append(0)
+        if state[down] == IN_MAZE: connected.append(1)
+        if state[left] == IN_MAZE: connected.append(2)
+        if state[right] == IN_MAZE: connected.append(3)
+        link[cell] = connected[int(links[used] * len(connected))]
+        used += 1
+        state[cell] = IN_MAZE
+
+        # Añadir sus vecinas sin visitar a la frontera
+        if state[up] == UNVISITED: state[up] = FRONTIER; frontier.append(up)
+        if state[down] == UNVISITED: state[down] = FRONTIER; frontier.append(down)
+        if state[left] == UNVISITED: state[left] = FRONTIER; frontier.append(left)
+        if state[right] == UNVISITED: state[right] = FRONTIER; frontier.append(right)
+
+    return _to_grid(width, height, state, link, stride, start)
+
+def backtracker_maze(width, height, seed=None):
+    """Búsqueda en profundidad aleatoria (recursive backtracker) con pila en array."""
+    rng = np.random.default_rng(seed)
+    state, stride = _cell_space(width, height)
+    link = bytearray(len(state))
+    steps = (-stride, stride, -1, 1)
+    back = (1, 0, 3, 2)  # Dirección opuesta de cada dirección
+    block = min(65536, len(state))
+    randoms = []
+    used = 0
+
+    start = stride + 1
+    state[start] = IN_MAZE
+    stack = [start]
+    while stack:
+        cell = stack[-1]
+        options = []
+        if state[cell - stride] == UNVISITED: options.append(0)
+        if state[cell + stride] == UNVISITED: options.append(1)
+        if state[cell - 1] == UNVISITED: options.append(2)
+        if state[cell + 1] == UNVISITED: options.append(3)
+        if not options:
+            stack.pop()
+            continue
+        if used == len(randoms):
+            randoms = rng.random(block).tolist()
+            used = 0
+        d = options[int(randoms[used] * len(options))]
+        used += 1
+        nxt = cell + steps[d]
+        state[nxt] = IN_MAZE
+        link[nxt] = back[d]
+        stack.append(nxt)
+
+    return _to_grid(width, height, state, link, stride, start)
+
+ALGORITHMS = {
+    "prim": prim_maze,
+    "backtracker": backtracker_maze,
+}
+
+def generate_maze(width, height, algorithm="prim", seed=None, cache_dir=None):
+    """Genera (o recupera de la caché) un laberinto como array (height, width) de 0/1.
+
+    Con ``seed`` y ``cache_dir``, el resultado se guarda en
+    ``cache_dir/maze_<width>x<height>_<algorithm>_<seed>.npz`` y las
+    llamadas siguientes con la misma clave lo leen en lugar de regenerarlo.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError("Algoritmo de laberinto no válido: " + str(algorithm))
+    path = None
+    if cache_dir is not None and seed is not None:
+        path = os.path.join(cache_dir, f"maze_{width}x{height}_{algorithm}_{seed}.npz")
+        if os.path.exists(path):
+            with np.load(path) as data:
+                return data["grid"]
+
+    grid = ALGORITHMS[algorithm](width, height, seed)
+
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, grid=grid)
+            os.replace(tmp, path)  # Escritura atómica: varios procesos pueden compartir la caché
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return grid
+
+def maze_seed(seed):
+    """Semilla efectiva: sin semilla explícita se deriva del módulo random (respeta random.seed)."""
+    return seed if seed is not None else random.getrandbits(32)
@@ -1,15 +1,15 @@
-from agentesRL import *
-from env_2D import *
-from env_frozen import *
-from env_maze import *
-from env_multigoal import *
+from agentesRL import Agent
+from env_frozen import FrozenLakeEnvironment
+from checkpoint import Checkpointer
+from estadisticas import RewardTracker
 import matplotlib.pyplot as plt
 import numpy as np
+import sys
 
 def moving_average(data, window_size):
     return np.convolve(data, np.ones(window_size) / window_size, mode='valid')
 
-def main():
+def main(checkpoint_path=None):
     env = FrozenLakeEnvironment(10, 10,slippery_float=0.4)
     agente1 = Agent(env)
     # agente2 = Agent(env,epsilon= 0.3)
@@ -17,7 +17,12 @@ def main():
     # agente4 = Agent(env,epsilon=0.9)
     env.render()
 
-    rewards_agente1 = agente1.train_q_learning(30000)
+    # Mismo resultado que train_q_learning, más rápido; con checkpoint_path (python main.py fichero.npz)
+    # se guarda un checkpoint cada 1000 episodios y se reanuda con checkpoint.load_checkpoint(fichero, env)
+    checkpoint = Checkpointer(checkpoint_path) if checkpoint_path else None
+    window_size = 20  # Tamaño de la ventana para el promedio móvil
+    tracker1 = RewardTracker(30000, window_size)  # Media móvil calculada en línea durante el entrenamiento
+    rewards_agente1 = agente1.train_fast(30000, checkpoint=checkpoint, tracker=tracker1)
     # rewards_agente2 = agente2.train_q_learning(200)
     # rewards_agente3 = agente3.train_q_learning(200)
     # rewards_agente4 = agente4.train_q_learning(200)
@@ -27,8 +32,7 @@ def main():
 
     plt.clf()
 
-    window_size = 20  # Tamaño de la ventana para el promedio móvil
-    ma_rewards_agente1 = moving_average(rewards_agente1, window_size)
+    ma_rewards_agente1 = tracker1.moving_average()
     # ma_rewards_agente2 = moving_average(rewards_agente2, window_size)
     # ma_rewards_agente3 = moving_average(rewards_agente3, window_size)
     # ma_rewards_agente4 = moving_average(rewards_agente4, window_size)
@@ -48,4 +52,4 @@ def main():
     # plt.legend()
     # plt.show()
 
-main()
\ No newline at end of file
+main(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
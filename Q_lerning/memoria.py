@@ -0,0 +1,67 @@
+import heapq
+
+import numpy as np
+
+class ReplayBuffer:
+    """Buffer circular de capacidad fija respaldado por arrays de NumPy.
+
+    Guarda transiciones con estados planos; al llenarse, cada nueva
+    transición sobrescribe la más antigua.
+    """
+    def __init__(self, capacity, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self.position = 0  # Próxima posición a escribir
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, state, action, reward, next_state, done):
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size):
+        """Muestra uniforme con reemplazo: (states, actions, rewards, next_states, dones)."""
+        idx = self.rng.integers(0, self.size, batch_size)
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx], self.dones[idx]
+
+    def __len__(self):
+        return self.size
+
+class PriorityQueue:
+    """Cola de máxima prioridad sobre heapq con supresión de duplicados.
+
+    Cada clave aparece como mucho una vez con su prioridad vigente: volver a
+    insertarla con una prioridad menor o igual no hace nada y, si es mayor,
+    la entrada antigua queda obsoleta y se descarta al extraerla.
+    """
+    def __init__(self):
+        self.heap = []
+        self.priority = {}  # clave -> prioridad vigente
+
+    def push(self, key, priority):
+        if priority <= self.priority.get(key, 0.0):
+            return
+        self.priority[key] = priority
+        heapq.heappush(self.heap, (-priority, key))
+
+    def pop(self):
+        """Extrae (clave, prioridad) con la prioridad más alta."""
+        while self.heap:
+            negative, key = heapq.heappop(self.heap)
+            if self.priority.get(key) == -negative:
+                del self.priority[key]
+                return key, -negative
+        raise IndexError("Cola de prioridad vacía")
+
+    def __len__(self):
+        return len(self.priority)
@@ -1,7 +1,8 @@
 import numpy as np
 import math
-import matplotlib.pyplot as plt
 import random
+from render_rapido import FastRenderer
+from discretizador import Discretizer
 
 class SimplePendulumEnv:
     def __init__(self):
@@ -18,9 +19,14 @@ class SimplePendulumEnv:
         # Espacios discretos para el estado y las acciones
         self.theta_bins = np.linspace(-self.max_theta, self.max_theta, 5)  # 10 divisiones del ángulo
         self.theta_dot_bins = np.linspace(-self.max_theta_dot, self.max_theta_dot, 5)  # 10 divisiones de la velocidad angular
+        # Equivale a np.digitize(x, bins) - 1 sobre los valores recortados: 5 celdas por dimensión
+        self.discretizer = Discretizer([self.theta_bins[1:], self.theta_dot_bins[1:]])
+        self.state_shape = self.discretizer.shape  # Celdas de (ángulo, velocidad)
         
         # Acciones discretas: Fuerzas aplicadas
         self.actions = [-5, -2, 0, 2, 5]
+        self.n_actions = len(self.actions)
+        self.max_episode_steps = 200  # Duración de un episodio de entrenamiento
 
         self.reset()
 
@@ -52,16 +58,15 @@ class SimplePendulumEnv:
         done = bool(self.theta <= -self.max_theta or self.theta >= self.max_theta)
 
         self.t += 1
-        return self._discretize_state(), reward, done, {}
+        return self._discretize_state(), reward, done
 
     def _discretize_state(self):
         """Discretiza el estado continuo en celdas."""
-        theta_idx = np.digitize(self.theta, self.theta_bins) - 1
-        theta_dot_idx = np.digitize(self.theta_dot, self.theta_dot_bins) - 1
-        return theta_idx, theta_dot_idx
+        return self.discretizer.indices((self.theta, self.theta_dot))
 
     def render(self):
         """Dibuja el entorno para visualizarlo."""
+        import matplotlib.pyplot as plt
         plt.clf()
         plt.xlim(-2, 2)
         plt.ylim(-2, 2)
@@ -80,8 +85,78 @@ class SimplePendulumEnv:
 
 
     def close(self):
+        import matplotlib.pyplot as plt
         plt.close()
 
+class BatchedPendulumEnv(SimplePendulumEnv):
+    """N péndulos integrados a la vez con arrays de NumPy.
+
+    Misma física, recompensa y discretización que SimplePendulumEnv, pero
+    ``step`` avanza todos los carriles y los discretiza con una sola llamada
+    por dimensión. Los estados discretos son un array (N, 2) de índices
+    (ángulo, velocidad). Los carriles que terminan o llegan a ``max_steps``
+    se reinician solos: ``step`` devuelve el estado alcanzado y
+    ``self.states`` ya contiene el del nuevo episodio.
+    """
+    def __init__(self, num_envs, max_steps=200, seed=None):
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+        self.theta = np.zeros(num_envs)
+        self.theta_dot = np.zeros(num_envs)
+        self.t = np.zeros(num_envs, dtype=np.int64)
+        self.truncated = np.zeros(num_envs, dtype=bool)  # Carriles cortados por max_steps en el último paso
+        super().__init__()  # Constantes del entorno y reset de todos los carriles
+        self.max_episode_steps = max_steps
+        self.forces = np.clip(np.array(self.actions, dtype=float), -10.0, 10.0)
+
+    def reset(self, mask=None):
+        """Reinicia todos los carriles, o solo los marcados en ``mask``."""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        n = np.count_nonzero(mask)
+        self.theta[mask] = self.rng.uniform(-0.05, 0.05, n)
+        self.theta_dot[mask] = 0.0
+        self.t[mask] = 0
+        self.states = self._discretize_state()
+        return self.states
+
+    def step(self, actions):
+        """Aplica un array de acciones y devuelve (estados, recompensas, fin) por carril."""
+        force = self.forces[actions]
+
+        cos_theta = np.cos(self.theta)
+        sin_theta = np.sin(self.theta)
+        total_mass = self.mass_cart + self.mass_pole
+        pole_mass_length = self.mass_pole * self.length
+
+        theta_double_dot = (self.gravity * sin_theta - cos_theta * (
+            force + pole_mass_length * self.theta_dot ** 2 * sin_theta)) / (
+                self.length * (4/3 - self.mass_pole * cos_theta ** 2 / total_mass))
+
+        self.theta_dot += theta_double_dot * self.dt
+        self.theta += self.theta_dot * self.dt
+
+        np.clip(self.theta, -self.max_theta, self.max_theta, out=self.theta)
+        np.clip(self.theta_dot, -self.max_theta_dot, self.max_theta_dot, out=self.theta_dot)
+
+        dones = (self.theta <= -self.max_theta) | (self.theta >= self.max_theta)
+        rewards = np.where(dones, -10.0, 1.0)
+        next_states = self._discretize_state()
+
+        self.t += 1
+        self.truncated = ~dones & (self.t >= self.max_episode_steps)
+        # Reinicio automático de los carriles que han terminado
+        finished = dones | self.truncated
+        if finished.any():
+            self.reset(finished)
+        else:
+            self.states = next_states
+        return next_states, rewards, dones
+
+    def _discretize_state(self):
+        """Discretiza todos los carriles: array (N, 2) de índices (ángulo, velocidad)."""
+        return self.discretizer.indices(np.stack([self.theta, self.theta_dot], axis=1))
+
 # Agente de Q-learning
 class QLearningAgent:
     def __init__(self, state_size, action_size, alpha=0.1, gamma=0.99, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995):
@@ -107,41 +182,78 @@ class QLearningAgent:
         if done:
             self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
 
-# Entrenamiento del agente
-env = SimplePendulumEnv()
-agent = QLearningAgent(state_size=(5, 5), action_size=len(env.actions))
+    def choose_actions_batch(self, states, rng=None):
+        """Acciones epsilon-voraces para un array (N, dims) de estados discretos; ``rng`` es un Generator."""
+        if rng is None:
+            rng = np.random.default_rng()
+        greedy = np.argmax(self.q_table[tuple(states.T)], axis=1)
+        explore = rng.random(len(states)) <= self.epsilon
+        return np.where(explore, rng.integers(0, self.action_size, len(states)), greedy)
 
-episodes = 1000
+    def learn_batch(self, states, actions, rewards, next_states, dones):
+        """Versión por lotes de learn; con pares (estado, acción) repetidos se aplica una sola actualización."""
+        index = tuple(states.T) + (actions,)
+        td_target = rewards + self.gamma * self.q_table[tuple(next_states.T)].max(axis=1) * (1 - dones)
+        self.q_table[index] += self.alpha * (td_target - self.q_table[index])
 
-for episode in range(episodes):
-    state = env.reset()
-    total_reward = 0
-    
-    for step in range(200):
-        #env.render()
-        action = agent.choose_action(state)
-        next_state, reward, done, _ = env.step(action)
-        agent.learn(state, action, reward, next_state, done)
-        
-        state = next_state
-        total_reward += reward
-        
-        if done:
-            print(f"Episodio {episode+1}, Recompensa total: {total_reward}")
-            break
-
-# Test
-for step in range(200):
-        env.render()
-        action = agent.choose_action(state)
-        next_state, reward, done, _ = env.step(action)
-        agent.learn(state, action, reward, next_state, done)
-        
-        state = next_state
-        total_reward += reward
+        self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay ** np.count_nonzero(dones))
+
+def train_batched(agent, num_episodes, num_envs=256, max_steps=200, seed=None):
+    """Entrena ``agent`` con BatchedPendulumEnv; devuelve la recompensa de cada episodio terminado."""
+    env = BatchedPendulumEnv(num_envs, max_steps, seed)
+    rng = env.rng
+    rewards_per_episode = []
+    returns = np.zeros(num_envs)  # Recompensa acumulada de cada carril
+    states = env.states
+    while len(rewards_per_episode) < num_episodes:
+        actions = agent.choose_actions_batch(states, rng)
+        next_states, rewards, dones = env.step(actions)
+        agent.learn_batch(states, actions, rewards, next_states, dones)
+        returns += rewards
+        finished = dones | env.truncated
+        if finished.any():
+            rewards_per_episode.extend(returns[finished].tolist())
+            returns[finished] = 0
+        states = env.states
+    return rewards_per_episode[:num_episodes]
+
+if __name__ == "__main__":
+    # Entrenamiento del agente
+    env = SimplePendulumEnv()
+    agent = QLearningAgent(state_size=env.state_shape, action_size=env.n_actions)
+
+    episodes = 1000
+
+    for episode in range(episodes):
+        state = env.reset()
+        total_reward = 0
         
-        if done:
-            print(f"Episodio {episode+1}, Recompensa total: {total_reward}")
-            break
+        for step in range(env.max_episode_steps):
+            #env.render()
+            action = agent.choose_action(state)
+            next_state, reward, done = env.step(action)
+            agent.learn(state, action, reward, next_state, done)
+            
+            state = next_state
+            total_reward += reward
+            
+            if done:
+                print(f"Episodio {episode+1}, Recompensa total: {total_reward}")
+                break
+
+    # Test
+    renderer = FastRenderer(env, pause_time=0.01)
+    for step in range(200):
+            renderer.step()
+            action = agent.choose_action(state)
+            next_state, reward, done = env.step(action)
+            agent.learn(state, action, reward, next_state, done)
+            
+            state = next_state
+            total_reward += reward
+            
+            if done:
+                print(f"Episodio {episode+1}, Recompensa total: {total_reward}")
+                break
 
-env.close()
+    env.close()
@@ -0,0 +1,95 @@
+import numpy as np
+
+# Planificación exacta sobre el modelo compilado de los entornos de cuadrícula
+# (next_state_table, reward_table, done_table y, en FrozenLake, slip_mixture).
+
+def _model(env):
+    """Extrae el modelo tabular del entorno: (next_state, reward, done, mixture, terminal)."""
+    next_state = env.next_state_table
+    reward = env.reward_table.astype(float)
+    done = env.done_table
+    mixture = env.slip_mixture() if hasattr(env, "slip_mixture") else np.eye(4)
+    # Estados en los que se termina el episodio: su valor es 0, como en la tabla Q del agente
+    terminal = np.zeros(len(next_state), dtype=bool)
+    terminal[next_state[done]] = True
+    return next_state, reward, done, mixture, terminal
+
+def _q_from_v(V, model, gamma):
+    """Q[s, a] = sum_b M[a, b] * (R[s, b] + gamma * V[s'(s, b)]) para todos los (s, a) a la vez."""
+    next_state, reward, done, mixture, terminal = model
+    backup = reward + gamma * np.where(done, 0.0, V[next_state])  # Valor de ejecutar b en s
+    Q = backup @ mixture.T
+    Q[terminal] = 0.0
+    return Q
+
+def _evaluate(policy, V, model, gamma, tol, max_sweeps):
+    """Evaluación iterativa de una política plana; devuelve (V, barridos)."""
+    states = np.arange(len(policy))
+    for sweep in range(1, max_sweeps + 1):
+        new_V = _q_from_v(V, model, gamma)[states, policy]
+        delta = np.max(np.abs(new_V - V))
+        V = new_V
+        if delta < tol:
+            break
+    return V, sweep
+
+def value_iteration(env, gamma=0.8, tol=1e-8, max_sweeps=10000):
+    """Iteración de valores vectorizada.
+
+    Devuelve ``(Q, V, policy, sweeps)`` con Q de forma (height, width, 4),
+    igual que ``Agent.Q``. Se detiene cuando el cambio máximo de V en un
+    barrido es menor que ``tol`` o tras ``max_sweeps`` barridos.
+    """
+    model = _model(env)
+    V = np.zeros(env.height * env.width)
+    for sweep in range(1, max_sweeps + 1):
+        Q = _q_from_v(V, model, gamma)
+        new_V = Q.max(axis=1)
+        delta = np.max(np.abs(new_V - V))
+        V = new_V
+        if delta < tol:
+            break
+    Q = _q_from_v(V, model, gamma)
+    shape = (env.height, env.width)
+    return Q.reshape(shape + (4,)), V.reshape(shape), Q.argmax(axis=1).reshape(shape), sweep
+
+def policy_iteration(env, gamma=0.8, tol=1e-8, max_sweeps=10000, max_iterations=1000):
+    """Iteración de políticas con evaluación iterativa vectorizada.
+
+    Devuelve ``(Q, V, policy, sweeps)``, donde ``sweeps`` cuenta los barridos
+    de evaluación de todas las iteraciones.
+    """
+    model = _model(env)
+    V = np.zeros(env.height * env.width)
+    policy = np.zeros(env.height * env.width, dtype=np.int64)
+    total_sweeps = 0
+    for _ in range(max_iterations):
+        V, sweeps = _evaluate(policy, V, model, gamma, tol, max_sweeps)
+        total_sweeps += sweeps
+        Q = _q_from_v(V, model, gamma)
+        # Mantener la acción actual en caso de empate para garantizar la terminación
+        current = Q[np.arange(len(policy)), policy]
+        new_policy = np.where(Q.max(axis=1) > current + tol, Q.argmax(axis=1), policy)
+        if np.array_equal(new_policy, policy):
+            break
+        policy = new_policy
+    shape = (env.height, env.width)
+    return Q.reshape(shape + (4,)), V.reshape(shape), policy.reshape(shape), total_sweeps
+
+def evaluate_policy(env, policy, gamma=0.8, tol=1e-8, max_sweeps=10000):
+    """Valor exacto V^pi (height, width) de una política determinista (height, width)."""
+    policy = np.asarray(policy).reshape(-1)
+    V, _ = _evaluate(policy, np.zeros(len(policy)), _model(env), gamma, tol, max_sweeps)
+    return V.reshape(env.height, env.width)
+
+def policy_regret(env, Q, gamma=0.8, tol=1e-8, max_sweeps=10000):
+    """Diferencia V*(inicio) - V^pi(inicio) de la política greedy de una tabla Q aprendida."""
+    _, V_opt, _, _ = value_iteration(env, gamma, tol, max_sweeps)
+    V_pi = evaluate_policy(env, np.argmax(Q, axis=-1), gamma, tol, max_sweeps)
+    return V_opt[0, 0] - V_pi[0, 0]
+
+def warm_start(agent, method=value_iteration, **kwargs):
+    """Inicializa ``agent.Q`` con la solución exacta calculada con el gamma del agente."""
+    Q, _, _, sweeps = method(agent.env, gamma=agent.gamma, **kwargs)
+    agent.Q[:] = Q
+    return sweeps
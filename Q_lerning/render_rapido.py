@@ -0,0 +1,145 @@
+import math
+
+class FastRenderer:
+    """Renderizado en vivo con blitting y salto de fotogramas, común a todos los entornos.
+
+    La parte estática (cuadrícula de paredes/agujeros, objetivo, base del
+    carro...) se dibuja una sola vez; en cada fotograma solo se actualizan los
+    artistas móviles y se copian sobre el fondo guardado. Se dibuja uno de
+    cada ``every_steps`` pasos de uno de cada ``every_episodes`` episodios.
+    """
+    def __init__(self, env, every_steps=1, every_episodes=1, pause_time=0.001, title=None):
+        self.env = env
+        self.every_steps = every_steps
+        self.every_episodes = every_episodes
+        self.pause_time = pause_time
+        self.title = title or type(env).__name__
+        self.fig = None
+        self.steps = 0  # Pasos del episodio actual
+        self.episodes = 0  # Episodios terminados
+
+        # Tipo de dibujo según los atributos del entorno
+        if hasattr(env, "grid") or hasattr(env, "lake"):
+            self._setup_scene, self._update_scene = self._setup_grid, self._update_grid
+        elif hasattr(env, "LINK_LENGTH_1"):
+            self._setup_scene, self._update_scene = self._setup_acrobot, self._update_acrobot
+        elif hasattr(env, "theta"):
+            self._setup_scene, self._update_scene = self._setup_pendulum, self._update_pendulum
+        else:
+            # Sin error hasta que se intente dibujar: un Agent puede entrenar sin renderizar (p. ej. RemoteEnv)
+            self._setup_scene = self._update_scene = self._unsupported
+
+    def _unsupported(self):
+        raise ValueError("Entorno no soportado por FastRenderer")
+
+    def step(self):
+        """Avisa de un paso; dibuja si toca según every_steps y every_episodes."""
+        if self.episodes % self.every_episodes == 0 and self.steps % self.every_steps == 0:
+            self.draw()
+        self.steps += 1
+
+    def end_episode(self):
+        """Avisa del final de un episodio."""
+        self.episodes += 1
+        self.steps = 0
+
+    def draw(self):
+        """Dibuja un fotograma con el estado actual del entorno."""
+        import matplotlib.pyplot as plt  # Importación perezosa: el entrenamiento sin pantalla no carga matplotlib
+        if self.fig is None or not plt.fignum_exists(self.fig.number):
+            self._setup()
+        self._update_scene()
+        canvas = self.fig.canvas
+        if self.background is not None:
+            canvas.restore_region(self.background)
+            for artist in self.dynamic:
+                self.ax.draw_artist(artist)
+            canvas.blit(self.ax.bbox)
+        else:
+            canvas.draw_idle()
+        canvas.flush_events()
+        if self.pause_time:
+            # A diferencia de plt.pause, no fuerza un redibujado completo de la figura
+            canvas.start_event_loop(self.pause_time)
+
+    def _setup(self):
+        import matplotlib.pyplot as plt
+        self.fig = plt.gcf()
+        self.fig.clf()
+        self.ax = self.fig.add_subplot()
+        self.dynamic = self._setup_scene()
+        for artist in self.dynamic:
+            artist.set_animated(True)  # Fuera del dibujado normal: solo se pintan con blit
+        self.ax.set_title(self.title)
+        plt.show(block=False)
+
+        self.background = None
+        canvas = self.fig.canvas
+        if getattr(canvas, "supports_blit", False):
+            canvas.mpl_connect("draw_event", self._capture_background)
+            canvas.draw()  # Dibuja la parte estática y dispara la captura del fondo
+
+    def _capture_background(self, event):
+        """Guarda el fondo estático (también tras redimensionar la ventana)."""
+        self.background = self.fig.canvas.copy_from_bbox(self.ax.bbox)
+        for artist in self.dynamic:
+            self.ax.draw_artist(artist)
+
+    # Entornos de cuadrícula: Environment2D, FrozenLake, Maze y MultiGoal
+    def _grid_position(self):
+        env = self.env
+        return env.get_grid(env.state) if hasattr(env, "get_grid") else env.state
+
+    def _setup_grid(self):
+        env = self.env
+        layout = env.lake if hasattr(env, "lake") else env.grid
+        self.ax.imshow(layout, cmap="gray_r", vmin=0, vmax=1, interpolation="nearest")
+        self.goal_marker, = self.ax.plot([env.goal[1]], [env.goal[0]], "o", color="red", label="Objetivo")
+        i, j = self._grid_position()
+        self.agent_marker, = self.ax.plot([j], [i], "o", color="blue", label="Agente")
+        self.ax.legend(loc="upper right")
+        return [self.agent_marker, self.goal_marker]
+
+    def _update_grid(self):
+        i, j = self._grid_position()
+        self.agent_marker.set_data([j], [i])
+        self.goal_marker.set_data([self.env.goal[1]], [self.env.goal[0]])  # MultiGoal cambia de objetivo
+
+    # SimplePendulumEnv
+    def _setup_pendulum(self):
+        self.ax.set_xlim(-2, 2)
+        self.ax.set_ylim(-2, 2)
+        self.ax.plot([-0.5, 0.5], [0, 0], "k-", lw=5)  # Base del carro
+        self.pole, = self.ax.plot([], [], "r-", lw=2)  # Brazo del péndulo
+        self.bob, = self.ax.plot([], [], "bo", markersize=10)  # Masa del péndulo
+        return [self.pole, self.bob]
+
+    def _update_pendulum(self):
+        env = self.env
+        x = env.length * math.sin(env.theta)
+        y = env.length * math.cos(env.theta)
+        self.pole.set_data([0, x], [0, y])
+        self.bob.set_data([x], [y])
+
+    # Acrobot_Env
+    def _setup_acrobot(self):
+        self.ax.set_xlim(-2, 2)
+        self.ax.set_ylim(-2, 2)
+        self.ax.set_aspect("equal")
+        target = self.env.target_position
+        self.ax.plot([target[0]], [target[1]], "rx", markersize=10, markeredgewidth=2)  # Objetivo
+        self.link1, = self.ax.plot([], [], "o-", markersize=8, linewidth=2, color="blue")
+        self.link2, = self.ax.plot([], [], "o-", markersize=8, linewidth=2, color="green")
+        self.tip, = self.ax.plot([], [], "ro")  # Extremo del acrobot
+        return [self.link1, self.link2, self.tip]
+
+    def _update_acrobot(self):
+        env = self.env
+        theta1, theta2 = env.state[0], env.state[1]
+        x1 = env.LINK_LENGTH_1 * math.sin(theta1)
+        y1 = -env.LINK_LENGTH_1 * math.cos(theta1)
+        x2 = x1 + env.LINK_LENGTH_2 * math.sin(theta1 + theta2)
+        y2 = y1 - env.LINK_LENGTH_2 * math.cos(theta1 + theta2)
+        self.link1.set_data([0, x1], [0, y1])
+        self.link2.set_data([x1, x2], [y1, y2])
+        self.tip.set_data([x2], [y2])
@@ -0,0 +1,400 @@
+import argparse
+import asyncio
+import copy
+import json
+import multiprocessing
+import socket
+import struct
+import time
+
+import numpy as np
+
+from entornos import make
+
+# Servidor de entornos sobre TCP local con asyncio.
+#
+# Cada conexión es una sesión con su propio episodio. Las peticiones son un
+# byte de operación (más la acción en STEP) y las respuestas un byte de
+# estado (0 = bien, 1 = error) seguido de:
+#   RESET -> fila/índice, columna/índice (2 x int32)
+#   STEP  -> estado (2 x int32), recompensa (float64), fin (bool)
+#   INFO  -> longitud (uint32) + JSON con los metadatos del entorno
+#   STATS -> longitud (uint32) + JSON con los contadores del servidor
+#   error -> longitud (uint32) + mensaje UTF-8
+# Los STEP de varias sesiones que llegan en la misma vuelta del bucle de
+# eventos se ejecutan juntos en una sola llamada por lotes.
+#
+#     python servidor.py serve FrozenLakeEnvironment --kw width=10 height=10
+#     python servidor.py bench --clients 16
+
+RESET, STEP, INFO, STATS, CLOSE = range(5)
+OK, ERROR = 0, 1
+OP = struct.Struct("<B")
+STEP_REQUEST = struct.Struct("<Bi")
+STATE = struct.Struct("<2i")
+STEP_RESPONSE = struct.Struct("<2id?")
+LENGTH = struct.Struct("<I")
+DEFAULT_PORT = 5555
+
+def _error_frame(message):
+    data = str(message).encode()
+    return OP.pack(ERROR) + LENGTH.pack(len(data)) + data
+
+def _json_frame(obj):
+    data = json.dumps(obj).encode()
+    return OP.pack(OK) + LENGTH.pack(len(data)) + data
+
+class _TableBackend:
+    """Sesiones como carriles sobre las tablas compiladas de un único entorno de cuadrícula.
+
+    Un lote de pasos es una consulta indexada por carril, como en
+    VectorGridEnv; los resbalones de FrozenLake se muestrean con ``seed``.
+    """
+    def __init__(self, env, seed=None):
+        self.width = env.width
+        self.next_state_table, self.reward_table, self.done_table = (
+            env.next_state_table, env.reward_table, env.done_table)
+        self.slip = env.slippery_float if getattr(env, "slippery", False) else 0.0
+        self.stays_on_done = hasattr(env, "lake")  # FrozenLake no avanza al caer o llegar a la meta
+        self.rng = np.random.default_rng(seed)
+        start = env.reset()
+        self.start = start[0] * self.width + start[1]
+        self.states = np.full(16, self.start, dtype=np.int64)
+        self.free = list(range(len(self.states)))[::-1]
+
+    def open(self):
+        if not self.free:
+            old = len(self.states)
+            self.states = np.concatenate([self.states, np.full(old, self.start, dtype=np.int64)])
+            self.free = list(range(old, 2 * old))[::-1]
+        return self.free.pop()
+
+    def close(self, session):
+        self.free.append(session)
+
+    def reset(self, session):
+        self.states[session] = self.start
+        return divmod(self.start, self.width)
+
+    def step_batch(self, sessions, actions):
+        sessions, actions = np.array(sessions), np.array(actions)
+        if self.slip > 0:
+            slipped = self.rng.random(len(sessions)) < self.slip
+            actions = np.where(slipped, self.rng.integers(0, 4, len(sessions)), actions)
+        states = self.states[sessions]
+        next_states = self.next_state_table[states, actions]
+        rewards = self.reward_table[states, actions]
+        dones = self.done_table[states, actions]
+        if self.stays_on_done:
+            self.states[sessions] = np.where(dones, states, next_states)
+        else:
+            self.states[sessions] = next_states
+        rows, cols = np.divmod(next_states, self.width)
+        return list(zip(zip(rows.tolist(), cols.tolist()), rewards.tolist(), dones.tolist()))
+
+class _ObjectBackend:
+    """Una copia superficial de ``prototype`` por sesión; el lote se recorre dentro de una sola vuelta del bucle.
+
+    Todas las sesiones comparten la disposición (laberinto, tablas, caché de
+    distancias de MultiGoal) y solo reasignan sus atributos de episodio.
+    """
+    def __init__(self, prototype):
+        self.prototype = prototype
+        self.envs = {}
+        self.next_session = 0
+
+    def open(self):
+        session = self.next_session
+        self.next_session += 1
+        self.envs[session] = copy.copy(self.prototype)
+        return session
+
+    def close(self, session):
+        del self.envs[session]
+
+    def reset(self, session):
+        return tuple(int(x) for x in self.envs[session].reset())
+
+    def step_batch(self, sessions, actions):
+        results = []
+        for session, action in zip(sessions, actions):
+            state, reward, done = self.envs[session].step(action)
+            results.append((tuple(int(x) for x in state), float(reward), bool(done)))
+        return results
+
+class EnvServer:
+    """Sirve el entorno ``name`` del registro (entornos.REGISTRY) a clientes RemoteEnv.
+
+    Los entornos con tablas compiladas comparten una sola disposición y se
+    avanzan de forma vectorizada; el resto (p. ej. SimplePendulumEnv o
+    MultiGoal) da a cada sesión una copia del mismo entorno construido con
+    ``env_kwargs``, así que todas ven la misma disposición aunque no haya
+    semilla. ``seed`` solo afecta a los resbalones de FrozenLake. Solo se admiten estados
+    discretos de dos componentes.
+    """
+    def __init__(self, name, env_kwargs=None, host="127.0.0.1", port=DEFAULT_PORT, seed=None):
+        env_kwargs = env_kwargs or {}
+        env = make(name, **env_kwargs)
+        if env.state_shape is None or len(env.state_shape) != 2:
+            raise ValueError("Solo se sirven entornos con estado discreto de dos componentes")
+        self.host = host
+        self.port = port
+        self.n_actions = env.n_actions
+        self.info = {"name": name, "state_shape": list(env.state_shape), "n_actions": env.n_actions}
+        for attr in ("width", "height", "max_episode_steps"):
+            if hasattr(env, attr):
+                self.info[attr] = getattr(env, attr)
+        if hasattr(env, "next_state_table"):
+            self.backend = _TableBackend(env, seed)
+        else:
+            self.backend = _ObjectBackend(env)
+        self.pending = []  # (sesión, acción, futuro) a la espera del siguiente lote
+        self.batches = 0
+        self.steps = 0
+        self.server = None
+
+    async def start(self):
+        """Abre el socket; con ``port=0`` el sistema elige uno libre (queda en self.port)."""
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def stats(self):
+        return {"batches": self.batches, "steps": self.steps,
+                "mean_batch": self.steps / self.batches if self.batches else 0.0}
+
+    def _flush(self):
+        """Ejecuta de una vez todos los STEP acumulados."""
+        pending, self.pending = self.pending, []
+        sessions = [p[0] for p in pending]
+        actions = [p[1] for p in pending]
+        try:
+            results = self.backend.step_batch(sessions, actions)
+        except Exception as e:
+            for _, _, future in pending:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.steps += len(pending)
+        for (_, _, future), result in zip(pending, results):
+            future.set_result(result)
+
+    def _step(self, session, action):
+        if not 0 <= action < self.n_actions:
+            raise ValueError("Acción no válida")
+        future = asyncio.get_running_loop().create_future()
+        if not self.pending:
+            # Los STEP que lleguen antes de que se ejecute _flush entran en el mismo lote
+            asyncio.get_running_loop().call_soon(self._flush)
+        self.pending.append((session, action, future))
+        return future
+
+    async def _handle(self, reader, writer):
+        writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        session = self.backend.open()
+        try:
+            while True:
+                try:
+                    op = (await reader.readexactly(1))[0]
+                    if op == STEP:
+                        action = struct.unpack("<i", await reader.readexactly(4))[0]
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                try:
+                    if op == STEP:
+                        state, reward, done = await self._step(session, action)
+                        writer.write(OP.pack(OK) + STEP_RESPONSE.pack(state[0], state[1], reward, done))
+                    elif op == RESET:
+                        writer.write(OP.pack(OK) + STATE.pack(*self.backend.reset(session)))
+                    elif op == INFO:
+                        writer.write(_json_frame(self.info))
+                    elif op == STATS:
+                        writer.write(_json_frame(self.stats()))
+                    elif op == CLOSE:
+                        break
+                    else:
+                        writer.write(_error_frame("Operación no válida: " + str(op)))
+                        break
+                except Exception as e:  # Cualquier fallo del entorno se responde; la conexión sigue
+                    writer.write(_error_frame(e))
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain()  # Solo se espera si el cliente no está leyendo
+        finally:
+            self.backend.close(session)
+            writer.close()
+
+class RemoteEnv:
+    """Cliente síncrono con la interfaz de un entorno: reset() y step(acción) -> (estado, recompensa, fin).
+
+    Copia del servidor ``state_shape``, ``n_actions`` y, si existen,
+    ``width``, ``height`` y ``max_episode_steps``, así que un Agent puede
+    entrenar sobre él sin cambios.
+    """
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, timeout=None):
+        self.sock = socket.create_connection((host, port), timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self.sock.makefile("rb")
+        info = self._request_json(INFO)
+        self.name = info["name"]
+        self.state_shape = tuple(info["state_shape"])
+        self.n_actions = info["n_actions"]
+        for attr in ("width", "height", "max_episode_steps"):
+            if attr in info:
+                setattr(self, attr, info[attr])
+        self.state = None
+
+    def _recv(self, size):
+        data = self._file.read(size)
+        if len(data) < size:
+            raise ConnectionError("El servidor cerró la conexión")
+        return data
+
+    def _check(self):
+        if self._recv(1)[0] != OK:
+            (size,) = LENGTH.unpack(self._recv(LENGTH.size))
+            raise ValueError(self._recv(size).decode())
+
+    def _request_json(self, op):
+        self.sock.sendall(OP.pack(op))
+        self._check()
+        (size,) = LENGTH.unpack(self._recv(LENGTH.size))
+        return json.loads(self._recv(size))
+
+    def reset(self):
+        self.sock.sendall(OP.pack(RESET))
+        self._check()
+        self.state = STATE.unpack(self._recv(STATE.size))
+        return self.state
+
+    def step(self, action):
+        self.sock.sendall(STEP_REQUEST.pack(STEP, action))
+        self._check()
+        row, col, reward, done = STEP_RESPONSE.unpack(self._recv(STEP_RESPONSE.size))
+        self.state = (row, col)
+        return self.state, reward, done
+
+    def server_stats(self):
+        """Contadores del servidor: lotes, pasos y tamaño medio de lote."""
+        return self._request_json(STATS)
+
+    def close(self):
+        try:
+            self.sock.sendall(OP.pack(CLOSE))
+        except OSError:
+            pass
+        self._file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _serve_process(name, env_kwargs, seed, ports):
+    """Proceso del servidor para el benchmark: publica el puerto elegido y sirve indefinidamente."""
+    async def main():
+        server = await EnvServer(name, env_kwargs, port=0, seed=seed).start()
+        ports.put(server.port)
+        await server.serve_forever()
+    asyncio.run(main())
+
+async def _client_loop(host, port, num_actions, steps, seed):
+    """Cliente asíncrono del benchmark: ``steps`` pasos con acciones aleatorias, reiniciando al terminar."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    actions = np.random.default_rng(seed).integers(0, num_actions, steps).tolist()
+    writer.write(OP.pack(RESET))
+    await reader.readexactly(1 + STATE.size)
+    for action in actions:
+        writer.write(STEP_REQUEST.pack(STEP, action))
+        data = await reader.readexactly(1 + STEP_RESPONSE.size)
+        if data[-1]:  # fin del episodio
+            writer.write(OP.pack(RESET))
+            await reader.readexactly(1 + STATE.size)
+    writer.write(OP.pack(CLOSE))
+    writer.close()
+
+def benchmark(name="FrozenLakeEnvironment", env_kwargs=None, clients=16, steps=20000, seed=0):
+    """Latencia de ida y vuelta de un cliente y rendimiento con ``clients`` sesiones concurrentes en localhost."""
+    env_kwargs = {"width": 10, "height": 10} if env_kwargs is None else env_kwargs
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve_process, args=(name, env_kwargs, seed, ports), daemon=True)
+    server.start()
+    try:
+        port = ports.get(timeout=30)
+        with RemoteEnv(port=port) as env:
+            actions = np.random.default_rng(seed).integers(0, env.n_actions, steps).tolist()
+            latencies = np.empty(steps)
+            env.reset()
+            for i, action in enumerate(actions):
+                start = time.perf_counter()
+                done = env.step(action)[2]
+                latencies[i] = time.perf_counter() - start
+                if done:
+                    env.reset()
+            num_actions = env.n_actions
+            before = env.server_stats()
+
+        async def run_clients():
+            await asyncio.gather(*(_client_loop("127.0.0.1", port, num_actions, steps // clients, seed + i)
+                                   for i in range(clients)))
+        start = time.perf_counter()
+        asyncio.run(run_clients())
+        seconds = time.perf_counter() - start
+        with RemoteEnv(port=port) as env:
+            after = env.server_stats()
+    finally:
+        server.terminate()
+        server.join()
+
+    batches = after["batches"] - before["batches"]
+    total = after["steps"] - before["steps"]
+    return {
+        "env": name,
+        "latency_us": {"mean": 1e6 * latencies.mean(),
+                       "p50": 1e6 * np.percentile(latencies, 50),
+                       "p99": 1e6 * np.percentile(latencies, 99)},
+        "single_client_steps_per_s": steps / latencies.sum(),
+        "clients": clients,
+        "concurrent_steps_per_s": total / seconds,
+        "mean_batch": total / batches if batches else 0.0,
+    }
+
+def _parse_kwargs(pairs):
+    """["width=10", "slippery_float=0.4"] -> {"width": 10, "slippery_float": 0.4}."""
+    kwargs = {}
+    for pair in pairs:
+        key, value = pair.split("=", 1)
+        try:
+            kwargs[key] = json.loads(value)
+        except json.JSONDecodeError:
+            kwargs[key] = value
+    return kwargs
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de entornos sobre TCP local.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="sirve un entorno")
+    serve.add_argument("env")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--seed", type=int)
+    serve.add_argument("--kw", nargs="*", default=[], help="argumentos del entorno clave=valor")
+    bench = sub.add_parser("bench", help="mide latencia y rendimiento en localhost")
+    bench.add_argument("--env", default="FrozenLakeEnvironment")
+    bench.add_argument("--kw", nargs="*", default=["width=10", "height=10"])
+    bench.add_argument("--clients", type=int, default=16)
+    bench.add_argument("--steps", type=int, default=20000)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = EnvServer(args.env, _parse_kwargs(args.kw), port=args.port, seed=args.seed)
+        asyncio.run(server.serve_forever())
+    else:
+        print(json.dumps(benchmark(args.env, _parse_kwargs(args.kw), args.clients, args.steps), indent=2))
@@ -0,0 +1,76 @@
+import numpy as np
+
+# Desplazamiento (fila, columna) de cada acción: Arriba, Abajo, Izquierda, Derecha
+MOVES = np.array([[-1, 0], [1, 0], [0, -1], [0, 1]])
+NUM_ACTIONS = len(MOVES)
+
+def compile_moves(walls):
+    """Tabla plana next_cell[s, a] de una cuadrícula con paredes.
+
+    Los estados son índices planos ``fila * width + columna``. Las salidas de
+    la cuadrícula se recortan al borde y los movimientos hacia una pared
+    dejan al agente donde estaba.
+    """
+    height, width = walls.shape
+    rows, cols = np.divmod(np.arange(height * width), width)
+    new_rows = np.clip(rows[:, None] + MOVES[:, 0], 0, height - 1)
+    new_cols = np.clip(cols[:, None] + MOVES[:, 1], 0, width - 1)
+    next_cell = new_rows * width + new_cols
+    blocked = walls.ravel()[next_cell]
+    return np.where(blocked, np.arange(height * width)[:, None], next_cell)
+
+def compile_grid_tables(walls, goal, step_reward, goal_reward, holes=None, hole_reward=0):
+    """Compila la dinámica de una cuadrícula en tablas planas (S, 4).
+
+    Devuelve ``next_state``, ``reward`` y ``done``. Los agujeros (``holes``)
+    terminan el episodio con ``hole_reward``; alcanzar ``goal`` lo termina con
+    ``goal_reward``; cualquier otro paso devuelve ``step_reward``.
+    """
+    height, width = walls.shape
+    next_state = compile_moves(walls)
+
+    at_goal = np.zeros(height * width, dtype=bool)
+    if 0 <= goal[0] < height and 0 <= goal[1] < width:  # El objetivo puede quedar fuera
+        at_goal[goal[0] * width + goal[1]] = True
+    at_goal = at_goal[next_state]
+    in_hole = np.zeros_like(at_goal) if holes is None else holes.ravel()[next_state]
+
+    reward = np.where(in_hole, hole_reward, np.where(at_goal, goal_reward, step_reward))
+    done = in_hole | at_goal
+    return next_state, reward, done
+
+class StepLookup(dict):
+    """Tabla de consulta de ``step``: fila s -> [(siguiente, recompensa, fin) por acción].
+
+    Las filas se construyen la primera vez que se visita cada estado, así
+    que compilar una cuadrícula enorme no cuesta tiempo de Python por
+    celda. Con ``flat`` el siguiente estado es el índice plano; si no, la
+    tupla (fila, columna).
+    """
+    def __init__(self, next_state, reward, done, width, flat=False):
+        super().__init__()
+        self.tables = (next_state, reward, done)
+        self.width = width
+        self.flat = flat
+
+    def __missing__(self, s):
+        next_state, reward, done = (table[s].tolist() for table in self.tables)
+        if not self.flat:
+            next_state = [divmod(ns, self.width) for ns in next_state]
+        row = self[s] = list(zip(next_state, reward, done))
+        return row
+
+def compile_step_lookup(next_state, reward, done, width):
+    """Consulta ``step`` con la tupla ``((fila, columna), recompensa, fin)`` de cada (s, a).
+
+    Permite que ``step`` sea un único acceso indexado con tipos de Python.
+    """
+    return StepLookup(next_state, reward, done, width)
+
+def slip_mixture(slip):
+    """Matriz M[a, b]: probabilidad de ejecutar b cuando se elige a.
+
+    Con probabilidad ``slip`` la acción se sustituye por una uniforme entre
+    las cuatro (incluida la propia), como en FrozenLakeEnvironment.
+    """
+    return (1 - slip) * np.eye(NUM_ACTIONS) + slip / NUM_ACTIONS
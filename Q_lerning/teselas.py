@@ -0,0 +1,92 @@
+import numpy as np
+
+class TileCoder:
+    """Codificación por teselas (tile coding) con índices dispersados en memoria fija.
+
+    Cada dimensión de la observación se escala a ``tiles_per_dim`` teselas
+    entre ``low`` y ``high``. Las ``num_tilings`` rejillas se desplazan una
+    fracción de tesela distinta por dimensión (desplazamientos asimétricos
+    1, 3, 5...), y las coordenadas de cada tesela se dispersan con un hash
+    lineal en ``[0, memory_size)``. La memoria no depende de la resolución.
+    """
+    def __init__(self, low, high, tiles_per_dim=8, num_tilings=8, memory_size=4096, seed=0):
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.tiles_per_dim = tiles_per_dim
+        self.num_tilings = num_tilings
+        self.memory_size = memory_size
+        dims = len(self.low)
+        self.scale = tiles_per_dim / (self.high - self.low)
+        # Desplazamiento de cada rejilla en fracciones de tesela: (num_tilings, dims)
+        self.offsets = (np.arange(num_tilings)[:, None] * (2 * np.arange(dims) + 1) / num_tilings) % 1.0
+        # Multiplicadores impares del hash para cada dimensión y para el número de rejilla
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(1, 2**62, dims + 1, dtype=np.uint64) | np.uint64(1)
+
+    def features(self, observations):
+        """Índices activos (N, num_tilings) de un lote de observaciones (N, dims); (num_tilings,) para una sola."""
+        observations = np.asarray(observations, dtype=float)
+        single = observations.ndim == 1
+        observations = np.atleast_2d(observations)
+        scaled = (np.clip(observations, self.low, self.high) - self.low) * self.scale
+        coords = np.floor(scaled[:, None, :] + self.offsets).astype(np.int64).astype(np.uint64)
+        tilings = np.arange(self.num_tilings, dtype=np.uint64)
+        hashed = (coords * self.multipliers[:-1]).sum(axis=2) + tilings * self.multipliers[-1]  # Aritmética módulo 2**64
+        indices = (hashed % np.uint64(self.memory_size)).astype(np.int64)
+        return indices[0] if single else indices
+
+class LinearQAgent:
+    """Q-learning o SARSA semigradiente lineal sobre las teselas de un TileCoder.
+
+    Q(s, a) es la suma de los pesos de las teselas activas de s para la
+    acción a; la tabla de pesos tiene tamaño fijo (memory_size, acciones).
+    """
+    def __init__(self, coder, num_actions, alpha=0.1, gamma=0.99, epsilon=0.1,
+                 algorithm="q_learning", seed=None):
+        if algorithm not in ("q_learning", "sarsa"):
+            raise ValueError("Algoritmo no válido: " + str(algorithm))
+        self.coder = coder
+        self.num_actions = num_actions
+        self.alpha = alpha / coder.num_tilings  # Paso repartido entre las rejillas
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.algorithm = algorithm
+        self.weights = np.zeros((coder.memory_size, num_actions))
+        self.rng = np.random.default_rng(seed)
+
+    def q_values(self, observations):
+        """Valores Q (N, acciones) de un lote de observaciones; (acciones,) para una sola."""
+        return self.weights[self.coder.features(observations)].sum(axis=-2)
+
+    def _choose(self, features):
+        if self.rng.random() < self.epsilon:
+            return int(self.rng.integers(self.num_actions))  # Exploración
+        return int(np.argmax(self.weights[features].sum(axis=0)))  # Explotación
+
+    def choose_action(self, observation):
+        return self._choose(self.coder.features(observation))
+
+    def train(self, env, num_episodes, max_steps=500):
+        """Entrena sobre un entorno continuo con step -> (obs, recompensa, fin); devuelve las recompensas por episodio."""
+        rewards_per_episode = []
+        for episode in range(num_episodes):
+            features = self.coder.features(env.reset())
+            action = self._choose(features)
+            total_reward = 0
+            for _ in range(max_steps):
+                observation, reward, done = env.step(action)
+                total_reward += reward
+                next_features = self.coder.features(observation)
+                next_action = self._choose(next_features)
+                target = reward
+                if not done:
+                    next_q = self.weights[next_features].sum(axis=0)
+                    target += self.gamma * (next_q[next_action] if self.algorithm == "sarsa" else next_q.max())
+                delta = target - self.weights[features, action].sum()
+                # np.add.at: dos rejillas pueden compartir índice por colisión del hash
+                np.add.at(self.weights[:, action], features, self.alpha * delta)
+                features, action = next_features, next_action
+                if done:
+                    break
+            rewards_per_episode.append(total_reward)
+        return rewards_per_episode
@@ -0,0 +1,150 @@
+import json
+import os
+
+import numpy as np
+
+class _Column:
+    """Columna en disco: np.memmap preasignado que crece por bloques de chunk_size filas."""
+    def __init__(self, path, dtype, shape, chunk_size):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape)
+        self.chunk_size = chunk_size
+        self.row_bytes = self.dtype.itemsize * int(np.prod(self.shape, dtype=np.int64))
+        self.capacity = 0
+        self.array = None
+        open(path, "wb").close()
+        self._grow()
+
+    def _grow(self):
+        if self.array is not None:
+            self.array.flush()
+            self.array = None  # Soltar el mapeo antes de ampliar el fichero
+        self.capacity += self.chunk_size
+        with open(self.path, "r+b") as f:
+            f.truncate(self.capacity * self.row_bytes)
+        self.array = np.memmap(self.path, dtype=self.dtype, mode="r+", shape=(self.capacity,) + self.shape)
+
+    def write(self, index, value):
+        if index == self.capacity:
+            self._grow()
+        self.array[index] = value
+
+    def flush(self):
+        self.array.flush()
+
+    def close(self, count):
+        """Vuelca los datos y recorta el fichero a las filas realmente escritas."""
+        self.array.flush()
+        self.array = None
+        with open(self.path, "r+b") as f:
+            f.truncate(count * self.row_bytes)
+
+class TrajectoryRecorder:
+    """Graba transiciones (state, action, reward, next_state, done) en ficheros np.memmap.
+
+    Cada campo va a su propio fichero ``<campo>.dat`` dentro de ``directory``;
+    ``episodes.dat`` guarda el índice de fin (exclusivo) de cada episodio y
+    ``meta.json`` los tipos, formas y número de filas. El tipo y la forma del
+    estado se deducen de la primera transición.
+    """
+    def __init__(self, directory, chunk_size=65536):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.count = 0  # Transiciones grabadas
+        self.num_episodes = 0
+        self.columns = None
+        self.episode_ends = _Column(os.path.join(directory, "episodes.dat"), np.int64, (), 1024)
+
+    def _open_columns(self, state):
+        state = np.asarray(state)
+        state_dtype = np.int32 if np.issubdtype(state.dtype, np.integer) else np.float64
+        specs = {
+            "state": (state_dtype, state.shape),
+            "action": (np.int32, ()),
+            "reward": (np.float64, ()),
+            "next_state": (state_dtype, state.shape),
+            "done": (np.bool_, ()),
+        }
+        self.columns = {name: _Column(os.path.join(self.directory, name + ".dat"), dtype, shape, self.chunk_size)
+                        for name, (dtype, shape) in specs.items()}
+
+    def record(self, state, action, reward, next_state, done):
+        """Añade una transición."""
+        if self.columns is None:
+            self._open_columns(state)
+        i = self.count
+        columns = self.columns
+        columns["state"].write(i, state)
+        columns["action"].write(i, action)
+        columns["reward"].write(i, reward)
+        columns["next_state"].write(i, next_state)
+        columns["done"].write(i, done)
+        self.count = i + 1
+
+    def end_episode(self):
+        """Marca el final del episodio actual."""
+        self.episode_ends.write(self.num_episodes, self.count)
+        self.num_episodes += 1
+
+    def _write_meta(self):
+        meta = {
+            "count": self.count,
+            "episodes": self.num_episodes,
+            "columns": {name: {"dtype": column.dtype.str, "shape": list(column.shape)}
+                        for name, column in (self.columns or {}).items()},
+        }
+        tmp = os.path.join(self.directory, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.directory, "meta.json"))
+
+    def flush(self):
+        """Vuelca a disco lo grabado hasta ahora; un lector ya puede abrirlo."""
+        for column in (self.columns or {}).values():
+            column.flush()
+        self.episode_ends.flush()
+        self._write_meta()
+
+    def close(self):
+        for column in (self.columns or {}).values():
+            column.close(self.count)
+        self.episode_ends.close(self.num_episodes)
+        self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class TrajectoryReader:
+    """Lectura perezosa de una grabación: cada episodio es un conjunto de vistas np.memmap."""
+    def __init__(self, directory):
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        self.count = meta["count"]
+        self.num_episodes = meta["episodes"]
+        self.columns = {
+            name: np.memmap(os.path.join(directory, name + ".dat"), dtype=np.dtype(spec["dtype"]),
+                            mode="r", shape=(self.count,) + tuple(spec["shape"]))
+            for name, spec in meta["columns"].items() if self.count > 0
+        }
+        self.episode_ends = (np.memmap(os.path.join(directory, "episodes.dat"), dtype=np.int64,
+                                       mode="r", shape=(self.num_episodes,))
+                             if self.num_episodes > 0 else np.zeros(0, dtype=np.int64))
+
+    def __len__(self):
+        return self.num_episodes
+
+    def episode(self, index):
+        """Diccionario {campo: vista} con las transiciones del episodio ``index``."""
+        start = int(self.episode_ends[index - 1]) if index > 0 else 0
+        end = int(self.episode_ends[index])
+        return {name: column[start:end] for name, column in self.columns.items()}
+
+    def episodes(self):
+        """Itera los episodios sin cargar la grabación en memoria."""
+        for index in range(self.num_episodes):
+            yield self.episode(index)